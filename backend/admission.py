@@ -0,0 +1,188 @@
+# Admission control for the expensive endpoints: a concurrency cap with a short
+# bounded wait queue per endpoint group, plus per-client token buckets. Requests
+# beyond either are turned away immediately (503 / 429 with Retry-After) so a
+# burst degrades into fast rejections instead of piling up Chrome sessions and
+# LLM calls. Implemented as plain ASGI middleware so streamed responses hold
+# their slot until the last byte is sent.
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+from backend import metrics
+
+ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+# How long a queued request may wait for a slot before getting a 503.
+QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+# Per-client buckets kept in memory; least recently seen clients are dropped first.
+MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+# Reverse proxies in front of the app that append to X-Forwarded-For. Without
+# this every client shares the proxy's address, and so one rate-limit bucket.
+# Render (which sets RENDER in the environment) runs one proxy hop; elsewhere
+# set TRUSTED_PROXY_HOPS, or TRUST_PROXY_HEADERS=1 for a single proxy.
+PROXY_HOPS = int(os.getenv(
+    "TRUSTED_PROXY_HOPS",
+    "1" if os.getenv("TRUST_PROXY_HEADERS") == "1" or os.getenv("RENDER") else "0",
+))
+
+
+def _env(group: str, name: str, default: float) -> float:
+    return float(os.getenv(f"ADMISSION_{group.upper()}_{name}", str(default)))
+
+
+class ConcurrencyLimiter:
+    def __init__(self, concurrency: int, queue_size: int, queue_timeout: float = QUEUE_TIMEOUT):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def acquire(self) -> bool:
+        # False means reject: the queue is full or the wait ran out.
+        if self.active >= self.concurrency and self.waiting >= self.queue_size:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._slots.release()
+
+
+class TokenBuckets:
+    # client -> (tokens, last refill time). Evicting a client only forgets a
+    # bucket that would otherwise refill, so the worst case is a fresh burst.
+    def __init__(self, rate_per_minute: float, burst: float, max_clients: int = MAX_CLIENTS):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    def take(self, client: str) -> float:
+        # Returns 0 if the request may proceed, else seconds until a token is due.
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate if self.rate else 60.0
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class Policy:
+    def __init__(self, group: str, paths, concurrency: int, queue_size: int, rate_per_minute: float, burst: float):
+        self.group = group
+        self.paths = frozenset(paths)
+        self.limiter = ConcurrencyLimiter(concurrency, queue_size)
+        self.buckets = TokenBuckets(rate_per_minute, burst) if rate_per_minute > 0 else None
+
+
+def default_policies() -> list:
+    # "llm" covers everything that calls the model; "requirements" everything that
+    # may scrape. Limits are overridable per group, e.g. ADMISSION_LLM_CONCURRENCY.
+    return [
+        Policy(
+            "llm",
+            ("/generate-roadmap", "/generate-roadmap/stream", "/api/plan", "/api/plan/stream", "/api/research"),
+            concurrency=int(_env("llm", "CONCURRENCY", 8)),
+            queue_size=int(_env("llm", "QUEUE", 16)),
+            rate_per_minute=_env("llm", "RATE", 10),
+            burst=_env("llm", "BURST", 5),
+        ),
+        Policy(
+            "requirements",
+            ("/api/requirements", "/visa", "/api/requirements/batch"),
+            concurrency=int(_env("requirements", "CONCURRENCY", 16)),
+            queue_size=int(_env("requirements", "QUEUE", 64)),
+            rate_per_minute=_env("requirements", "RATE", 60),
+            burst=_env("requirements", "BURST", 20),
+        ),
+    ]
+
+
+def client_address(scope) -> str:
+    if PROXY_HOPS:
+        # Entries left of the ones our proxies appended are client-supplied and
+        # can be forged, so count hops from the right.
+        hops = [hop.strip() for name, value in scope.get("headers", ()) if name == b"x-forwarded-for"
+                for hop in value.decode("latin-1").split(",") if hop.strip()]
+        if len(hops) >= PROXY_HOPS:
+            return hops[-PROXY_HOPS]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, policies=None):
+        self.app = app
+        self.policies = policies if policies is not None else default_policies()
+        self._by_path = {path: policy for policy in self.policies for path in policy.paths}
+        _middlewares.append(self)
+
+    async def __call__(self, scope, receive, send):
+        policy = self._by_path.get(scope.get("path")) if scope["type"] == "http" else None
+        if policy is None or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if policy.buckets is not None:
+            wait = policy.buckets.take(client_address(scope))
+            if wait:
+                await self._reject(send, policy, 429, "rate_limited", "Too many requests; slow down.", wait)
+                return
+
+        if not await policy.limiter.acquire():
+            await self._reject(send, policy, 503, "overloaded", "Server is busy; try again shortly.", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            policy.limiter.release()
+
+    @staticmethod
+    async def _reject(send, policy: Policy, status: int, reason: str, message: str, retry_after: float):
+        metrics.ADMISSION_REJECTIONS.inc(group=policy.group, reason=reason)
+        metrics.log_event("admission_rejected", group=policy.group, reason=reason)
+        body = json.dumps({"error": message}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, round(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+_middlewares = []
+
+
+@metrics.collector
+def admission_metrics():
+    for middleware in _middlewares:
+        for policy in middleware.policies:
+            labels = {"group": policy.group}
+            yield "admission_active", "gauge", "Requests holding an admission slot.", labels, policy.limiter.active
+            yield "admission_waiting", "gauge", "Requests queued for an admission slot.", labels, policy.limiter.waiting
+            if policy.buckets is not None:
+                yield "rate_limit_clients", "gauge", "Clients with a tracked token bucket.", labels, len(policy.buckets)
@@ -0,0 +1,114 @@
+# Local stand-in for the OpenAI chat completions API, for exercising the roadmap
+# endpoints without a key or network access:
+#
+#   uvicorn backend.dev.mock_openai:app --port 8001
+#   OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock uvicorn backend.main:app
+#
+# MOCK_OPENAI_LATENCY delays the first byte, MOCK_OPENAI_CHUNK_DELAY paces streamed chunks,
+# MOCK_OPENAI_TRUNCATE cuts that many characters off the end to simulate a cut-off completion.
+import asyncio
+import json
+import os
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+LATENCY = float(os.getenv("MOCK_OPENAI_LATENCY", "0.5"))
+CHUNK_DELAY = float(os.getenv("MOCK_OPENAI_CHUNK_DELAY", "0.02"))
+TRUNCATE = int(os.getenv("MOCK_OPENAI_TRUNCATE", "0"))
+CHUNK_SIZE = 16
+
+MOCK_ROADMAP = {
+    "roadmap": "Secure admission to an accredited institution, prepare proof of funds, sit an English test and apply for the study visa at least three months before your programme starts.",
+    "checklist": [
+        "Shortlist programmes and confirm entry requirements",
+        "Take IELTS or TOEFL",
+        "Obtain an admission letter",
+        "Prepare proof of financial support",
+        "Submit the student visa application"
+    ],
+    "sop": "I am applying to further my studies abroad in order to deepen my expertise and contribute to my field.",
+    "opportunities": [
+        {"title": "Chevening Scholarships", "url": "https://www.chevening.org", "type": "scholarship"},
+        {"title": "DAAD Scholarships", "url": "https://www.daad.de", "type": "scholarship"},
+        {"title": "Student visa guidance", "url": "https://www.gov.uk/student-visa", "type": "visa"}
+    ]
+}
+
+app = FastAPI()
+# System prompts seen so far; a repeat is reported as cached prompt tokens,
+# like the provider's prefix cache: only prefixes of at least 1024 tokens are
+# cached, in 128-token increments.
+_seen_prefixes = set()
+MIN_CACHED_PREFIX = 1024
+CACHE_INCREMENT = 128
+
+
+def _usage(messages: list, completion: str) -> dict:
+    # Rough 4-characters-per-token estimate, good enough for exercising accounting.
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+    completion_tokens = len(completion) // 4
+    prefix = messages[0].get("content") or "" if messages else ""
+    prefix_tokens = len(prefix) // 4
+    cached_tokens = 0
+    if prefix in _seen_prefixes and prefix_tokens >= MIN_CACHED_PREFIX:
+        cached_tokens = prefix_tokens // CACHE_INCREMENT * CACHE_INCREMENT
+    _seen_prefixes.add(prefix)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens}
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "mock")
+    content = json.dumps(MOCK_ROADMAP, indent=2)
+    if TRUNCATE:
+        content = content[:-TRUNCATE]
+    created = int(time.time())
+    await asyncio.sleep(LATENCY)
+
+    if not body.get("stream"):
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": _usage(body.get("messages", []), content)
+        }
+
+    async def events():
+        for i in range(0, len(content), CHUNK_SIZE):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[i:i + CHUNK_SIZE]}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(CHUNK_DELAY)
+        final = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = {**final, "choices": [], "usage": _usage(body.get("messages", []), content)}
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -0,0 +1,75 @@
+# Cheap local repair for model output that is almost JSON: markdown fences,
+# leading chatter, trailing commas, or a completion cut off mid-object.
+import json
+import re
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _scan(text: str):
+    # Returns (open bracket stack, inside-string flag, [(comma index, stack at comma)]).
+    stack = []
+    in_string = False
+    escape = False
+    commas = []
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            commas.append((index, list(stack)))
+    return stack, in_string, commas
+
+
+def _close(stack: list) -> str:
+    return "".join(_CLOSERS[char] for char in reversed(stack))
+
+
+def _loads(candidate: str):
+    for text in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def repair_json(text: str):
+    # Returns (data, truncated); truncated is True when the object had to be
+    # closed or cut back, i.e. some of the model's output was lost.
+    if not text:
+        return None, False
+    start = text.find("{")
+    if start == -1:
+        return None, False
+    text = text[start:]
+
+    # Complete object followed by a closing fence or commentary.
+    end = text.rfind("}")
+    if end != -1:
+        data = _loads(text[:end + 1])
+        if data is not None:
+            return data, False
+
+    # Truncated: close what is open, or back off to the last complete member.
+    stack, in_string, commas = _scan(text)
+    data = _loads(text + ('"' if in_string else "") + _close(stack))
+    if data is not None:
+        return data, True
+    for index, comma_stack in reversed(commas):
+        data = _loads(text[:index] + _close(comma_stack))
+        if data is not None:
+            return data, True
+    return None, True
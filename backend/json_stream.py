@@ -0,0 +1,53 @@
+# Incremental parser for a streamed JSON object: yields each top-level field as
+# soon as its value is complete, so clients can render before the model finishes.
+import json
+
+
+class TopLevelFieldParser:
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._segment_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        fields = []
+        while self._pos < len(self.buffer) and not self.done:
+            char = self.buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Text before the opening brace (e.g. a ```json fence) is ignored.
+                self._in_string = self._depth > 0
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._segment_start = self._pos + 1
+            elif char in "}]" and self._depth > 0:
+                if self._depth == 1:
+                    fields.extend(self._close_segment())
+                    self.done = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                fields.extend(self._close_segment())
+                self._segment_start = self._pos + 1
+            self._pos += 1
+        return fields
+
+    def _close_segment(self) -> list:
+        segment = self.buffer[self._segment_start:self._pos].strip()
+        if not segment:
+            return []
+        try:
+            return list(json.loads("{" + segment + "}").items())
+        except json.JSONDecodeError:
+            return []
@@ -0,0 +1,116 @@
+# knowledge/base.py
+# Curated study-visa requirements (documents, fees, timelines, language tests,
+# links) per country and visa type, built offline by backend/knowledge/build.py
+# and loaded once into memory. Answers lookups without any network access;
+# scrapers and the LLM enrich or verify it rather than being the only source.
+# Records are plain dicts here; they are validated once, at build time.
+import copy
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+KB_DIR = os.path.dirname(__file__)
+CURATED_PATH = os.path.join(KB_DIR, "curated.json")
+KB_PATH = os.getenv("KNOWLEDGE_BASE_PATH", os.path.join(KB_DIR, "knowledge_base.json"))
+FORMAT_VERSION = 1
+
+
+def visa_type_keys(visa_type: str) -> list:
+    # "F-1 (Academic)" is reachable as "f-1 (academic)" and "f-1".
+    full = " ".join(visa_type.lower().split())
+    short = full.split(" (")[0]
+    return list(dict.fromkeys([full, short]))
+
+
+def fee_summary(fees: dict) -> str:
+    if "total" in fees:
+        return fees["total"]
+    return "; ".join(f"{name.replace('_', ' ').capitalize()}: {amount}" for name, amount in fees.items())
+
+
+class KnowledgeBase:
+    def __init__(self, path: str = KB_PATH):
+        self.path = path
+        self._records = None
+        self._index = {}
+        self.as_of = None
+        self.built_at = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._records is not None:
+            return
+        with self._lock:
+            if self._records is not None:
+                return
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[ERROR] Could not load knowledge base from {self.path}: {e}")
+                data = {"records": [], "index": {}}
+            self._index = data["index"]
+            self.as_of = data.get("as_of")
+            self.built_at = data.get("built_at")
+            self._records = data["records"]
+
+    def keys(self) -> list:
+        self._ensure_loaded()
+        return list(self._index)
+
+    def lookup(self, key: str, visa_type: str = None):
+        # Raw record for a scraper key and optional visa type, or None.
+        self._ensure_loaded()
+        by_type = self._index.get(key)
+        if by_type is None:
+            return None
+        position = by_type.get(visa_type_keys(visa_type)[0] if visa_type else "")
+        return self._records[position] if position is not None else None
+
+    def payload(self, key: str, visa_type: str = None):
+        # The record shaped like a scraper payload, so it can stand in for one.
+        record = self.lookup(key, visa_type)
+        if record is None:
+            return None
+        payload = {
+            "country": record["country"],
+            "visa_type": record["visa_type"],
+            "documents": list(record["documents"]),
+            "fees": fee_summary(record["fees"]),
+            "fee_breakdown": dict(record["fees"]),
+            "language_requirements": record["language_requirements"],
+            "language_tests": list(record["language_tests"]),
+            "timeline": record["timeline"],
+            "official_links": list(record["official_links"]),
+            "special_notes": list(record["special_notes"]),
+            "source": "knowledge_base",
+            "as_of": self.as_of,
+        }
+        visa_types = [self._records[i]["visa_type"] for i in sorted(set(self._index[key].values()))]
+        if len(visa_types) > 1:
+            payload["visa_types"] = visa_types
+        if "verification" in record:
+            payload["verification"] = copy.deepcopy(record["verification"])
+        return payload
+
+
+def seed_cache(cache, kb=None) -> int:
+    # Fill countries with no snapshot yet, dated as_of so the first refresh
+    # (prefetch or stale-while-revalidate) replaces them with a live scrape.
+    # Without an as_of they are dated to the epoch, so they never count as fresh.
+    kb = kb or knowledge_base
+    seeded = 0
+    fetched_at = 0
+    if kb.keys() and kb.as_of:
+        fetched_at = datetime.fromisoformat(kb.as_of).replace(tzinfo=timezone.utc).timestamp()
+    for key in kb.keys():
+        if cache.peek(key) is None:
+            payload = kb.payload(key)
+            payload["used_fallback"] = True
+            cache.set(key, payload, fetched_at=fetched_at)
+            seeded += 1
+    return seeded
+
+
+knowledge_base = KnowledgeBase()
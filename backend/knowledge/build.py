@@ -0,0 +1,125 @@
+# knowledge/build.py
+# Offline ingestion job: validates the hand-maintained records in curated.json,
+# checks them against the latest scraped snapshots, and writes the compact
+# indexed knowledge_base.json the API loads at startup.
+#
+#   python -m backend.knowledge.build [--no-verify] [--output path]
+import argparse
+import json
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from pydantic import BaseModel, ValidationError
+
+from backend.knowledge.base import CURATED_PATH, FORMAT_VERSION, KB_PATH, visa_type_keys
+from backend.scrape.compare import document_key
+
+
+class VisaRecord(BaseModel):
+    country_key: str
+    country: str
+    visa_type: str
+    # The record served when no visa type is asked for.
+    default: bool = False
+    documents: List[str]
+    fees: Dict[str, str] = {}
+    language_tests: List[str] = []
+    language_requirements: str = ""
+    timeline: str = ""
+    official_links: List[str] = []
+    special_notes: List[str] = []
+
+
+def load_curated(path: str = CURATED_PATH):
+    with open(path, encoding="utf-8") as f:
+        curated = json.load(f)
+    records = []
+    for position, raw in enumerate(curated["records"]):
+        try:
+            records.append(VisaRecord.model_validate(raw).model_dump())
+        except ValidationError as e:
+            raise SystemExit(f"[ERROR] Record {position} in {path} is invalid:\n{e}")
+    return curated["as_of"], records
+
+
+def build_index(records: list) -> dict:
+    # scraper key -> {normalized visa type: record position}; "" is the default.
+    index = {}
+    for position, record in enumerate(records):
+        by_type = index.setdefault(record["country_key"], {})
+        for name in visa_type_keys(record["visa_type"]):
+            if name in by_type:
+                raise SystemExit(f"[ERROR] Duplicate visa type '{name}' for {record['country_key']}")
+            by_type[name] = position
+        if record["default"]:
+            if "" in by_type:
+                raise SystemExit(f"[ERROR] More than one default record for {record['country_key']}")
+            by_type[""] = position
+    for key, by_type in index.items():
+        if "" not in by_type:
+            raise SystemExit(f"[ERROR] No default record for {key}")
+    return index
+
+
+def verify(records: list, index: dict, store) -> dict:
+    # Compares each country's default record with its latest live scrape by
+    # document category; nothing is overwritten, the result is attached for review.
+    snapshots = store.latest_all()
+    report = {}
+    for key, by_type in index.items():
+        snapshot = snapshots.get(key)
+        if snapshot is None or snapshot[0].get("used_fallback"):
+            continue
+        payload, checked_at = snapshot
+        record = records[by_type[""]]
+        curated = {document_key(doc) for doc in record["documents"]}
+        scraped = {document_key(doc): doc for doc in payload.get("documents") or []}
+        record["verification"] = report[key] = {
+            "checked_at": datetime.fromtimestamp(checked_at, timezone.utc).isoformat(),
+            "confirmed": sorted(curated & set(scraped)),
+            "unconfirmed": sorted(curated - set(scraped)),
+            "new_on_source": [doc for category, doc in scraped.items() if category not in curated],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline visa requirements knowledge base.")
+    parser.add_argument("--curated", default=CURATED_PATH)
+    parser.add_argument("--output", default=KB_PATH)
+    parser.add_argument("--no-verify", action="store_true", help="skip the comparison with scraped snapshots")
+    args = parser.parse_args()
+
+    as_of, records = load_curated(args.curated)
+    index = build_index(records)
+
+    # Importing the scrapers registers them; every record must map onto one.
+    from backend.scrape.requirements import SCRAPERS
+
+    unknown = sorted(set(index) - set(SCRAPERS))
+    if unknown:
+        raise SystemExit(f"[ERROR] No scraper registered for: {', '.join(unknown)}")
+
+    if not args.no_verify:
+        from backend.scrape.snapshots import open_default_store
+
+        store = open_default_store()
+        report = verify(records, index, store) if store is not None else {}
+        for key, result in report.items():
+            print(f"[INFO] {key}: {len(result['confirmed'])} confirmed, {len(result['unconfirmed'])} unconfirmed, "
+                  f"{len(result['new_on_source'])} new on source")
+
+    data = {
+        "version": FORMAT_VERSION,
+        "as_of": as_of,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "index": index,
+        "records": records,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"[INFO] Wrote {len(records)} record(s) for {len(index)} countries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,65 @@
 from fastapi import FastAPI, Request, Query
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from openai import OpenAI
-import os
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import json
+import os
+import time
+import uuid
+from functools import partial
 from dotenv import load_dotenv
 
+from backend import admission, metrics
+from backend.knowledge.base import knowledge_base, seed_cache
+from backend.models import UserProfile, RequestData, BatchRequestData, ResearchRequest
+from backend.roadmap import generate_roadmap_data, stream_roadmap_events, token_usage
+from backend.roadmap_cache import roadmap_cache
+
 # Scraper imports
-from backend.scrape.requirements import scrape_canada
-from backend.scrape.requirements import scrape_uk
-from backend.scrape.requirements import scrape_germany
-from backend.scrape.requirements import scrape_usa
+from backend.scrape.async_scrape import scrape_country, close_async_client
+from backend.scrape.cache import requirements_cache
+from backend.scrape.registry import resolve
+from backend.scrape.driver_pool import driver_pool
+from backend.scrape import prefetch
+from backend.scrape.compare import compare_documents
+from backend.scrape.research import research_jobs
 
 # === ENVIRONMENT SETUP ===
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm start: serve the last persisted scrape per country straight away.
+    warmed = requirements_cache.warm()
+    print(f"[INFO] Loaded {warmed} requirement snapshot(s) from disk")
+    # Countries never scraped yet start from the curated knowledge base.
+    seeded = seed_cache(requirements_cache)
+    print(f"[INFO] Seeded {seeded} countr{'y' if seeded == 1 else 'ies'} from the knowledge base")
+    # Scraping happens off the request path: here on a schedule, or in the
+    # standalone worker (python -m backend.scrape.prefetch) whose snapshots we re-read.
+    scheduler, syncer = None, None
+    if prefetch.MODE == "inline":
+        scheduler = prefetch.PrefetchScheduler()
+        scheduler.start()
+    elif prefetch.MODE == "external":
+        syncer = asyncio.create_task(prefetch.sync_from_store())
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    if syncer is not None:
+        syncer.cancel()
+    await research_jobs.close()
+    await asyncio.to_thread(roadmap_cache.flush)
+    await close_async_client()
+    driver_pool.close()
+
+app = FastAPI(lifespan=lifespan)
+
+# === ADMISSION CONTROL ===
+# Innermost, so CORS headers still reach rejected browser requests.
+if admission.ENABLED:
+    app.add_middleware(admission.AdmissionMiddleware)
 
 # === CORS SETUP ===
 app.add_middleware(
@@ -26,18 +69,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# === DATA MODELS ===
+# === METRICS ===
+# Per-request timing and a request id that structured log lines carry along.
+# Not installed at all with METRICS_ENABLED=0.
+
+async def record_request(request: Request, call_next):
+    rid = request.headers.get("x-request-id") or uuid.uuid4().hex[:16]
+    token = metrics.request_id.set(rid)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["x-request-id"] = rid
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        route = request.scope.get("route")
+        # The route template, not the raw path, keeps label cardinality bounded.
+        path = route.path if route is not None else "unmatched"
+        metrics.HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=path, status=status)
+        metrics.log_event("http_request", method=request.method, route=path, status=status, seconds=round(elapsed, 4))
+        metrics.request_id.reset(token)
+
+if metrics.ENABLED:
+    app.middleware("http")(record_request)
 
-class UserProfile(BaseModel):
-    fullName: str
-    degree: str
-    workExperience: str
-    targetCountry: str
-    goal: str
+@metrics.collector
+def cache_metrics():
+    for cache, stats in (("roadmap", roadmap_cache.stats()), ("requirements", requirements_cache.stats())):
+        for result, key in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses")):
+            if key in stats:
+                yield "cache_lookups_total", "counter", "Cache lookups by result.", {"cache": cache, "result": result}, stats[key]
+        yield "cache_hit_ratio", "gauge", "Share of lookups answered from cache.", {"cache": cache}, stats["hit_ratio"]
+        yield "cache_entries", "gauge", "Entries currently cached.", {"cache": cache}, stats["entries"]
+    pool = driver_pool.stats()
+    yield "browser_pool_idle", "gauge", "Warm Chrome sessions waiting in the pool.", {}, pool["idle"]
 
-class RequestData(BaseModel):
-    country: str
-    nationality: str = "Nigeria"
+@app.get("/metrics")
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # === ROUTE: /generate-roadmap ===
 @app.get("/")
@@ -45,96 +116,206 @@ def read_root():
     return {"message": "Welcome to JapaAdvisor API!"}
 
 @app.post("/generate-roadmap")
-def generate_roadmap(profile: UserProfile):
-    prompt = f"""
-You are an expert immigration and education advisor. A Nigerian user has submitted the following profile:
-
-- Name: {profile.fullName}
-- Degree: {profile.degree}
-- Work Experience: {profile.workExperience}
-- Target Country: {profile.targetCountry}
-- Career/Education Goal: {profile.goal}
-
-Your job is to return a structured JSON object with 4 fields:
-
-1. "roadmap": A short paragraph explaining the steps this person should take to move to {profile.targetCountry}.
-2. "checklist": A JSON list of 5–7 bullet points with practical steps and documents.
-3. "sop": A formal academic-style Statement of Purpose based on their background and goal.
-4. "opportunities": A list of 3–5 relevant links to scholarship, visa, or university resources for {profile.targetCountry}. Each item should include:
-   - "title": short name of the opportunity
-   - "url": a valid link (you can use placeholders if needed)
-   - "type": one of ["scholarship", "university", "visa", "other"]
-
-Return ONLY a valid JSON object like this:
-{{
-  "roadmap": "...",
-  "checklist": ["...", "..."],
-  "sop": "...",
-  "opportunities": [
-    {{
-      "title": "...",
-      "url": "...",
-      "type": "scholarship"
-    }},
-    ...
-  ]
-}}
-
-Do not include any explanations, formatting, or markdown — only valid JSON.
-"""
+async def generate_roadmap(profile: UserProfile):
+    return await generate_roadmap_data(profile)
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an education and immigration advisor."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        message = response.choices[0].message.content
-        data = json.loads(message)
-        return data
-
-    except json.JSONDecodeError:
-        return {"error": "Failed to parse GPT response", "raw": message}
-    except Exception as e:
-        return {"error": str(e)}
+# === ROUTE: /generate-roadmap/stream ===
+# NDJSON: one {"field": ..., "value": ...} line per roadmap field as the model
+# produces it, then {"done": true}.
+
+@app.post("/generate-roadmap/stream")
+async def generate_roadmap_stream(profile: UserProfile):
+    async def lines():
+        async for event in stream_roadmap_events(profile):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/generate-roadmap/cache")
+def get_roadmap_cache_stats():
+    return roadmap_cache.stats()
+
+@app.get("/generate-roadmap/usage")
+def get_roadmap_token_usage():
+    return token_usage.report()
 
 # === ROUTE: /api/requirements ===
 
-@app.post("/api/requirements")
-def fetch_requirements(request: RequestData):
-    try:
-        country = request.country.strip().lower()
-
-        if country == "canada":
-            return scrape_canada()
-        elif country == "uk" or country == "united kingdom":
-            return scrape_uk()
-        elif country == "usa" or country == "united states":
-            return scrape_usa()
-        elif country == "germany":
-            return scrape_germany()
-        else:
-            return {"error": f"Scraper not available for '{request.country}' yet."}
+async def lookup_requirements(key: str):
+    if prefetch.MODE != "off":
+        return await prefetch.serve_cached(key)
+    return await requirements_cache.aget(key, partial(scrape_country, key))
 
+async def requirements_for(country: str):
+    scraper = resolve(country)
+    if scraper is None:
+        return {"error": f"Scraper not available for '{country}' yet."}
+    try:
+        return await lookup_requirements(scraper.key)
     except Exception as e:
         return {"error": str(e)}
+
+@app.post("/api/requirements")
+async def fetch_requirements(request: RequestData):
+    return await requirements_for(request.country)
+
 @app.get("/visa")
-def get_visa_requirements(country: str = Query(...)):
-    try:
-        country = country.strip().lower()
-
-        if country == "canada":
-            return scrape_canada()
-        elif country == "uk" or country == "united kingdom":
-            return scrape_uk()
-        elif country == "usa" or country == "united states":
-            return scrape_usa()
-        elif country == "germany":
-            return scrape_germany()
+async def get_visa_requirements(country: str = Query(...)):
+    return await requirements_for(country)
+
+# === ROUTE: /api/requirements/batch ===
+# Several countries in one call, looked up concurrently. Countries that miss the
+# deadline are reported in "timed_out" while the others are still returned.
+
+BATCH_TIMEOUT = float(os.getenv("REQUIREMENTS_BATCH_TIMEOUT", "20"))
+
+@app.post("/api/requirements/batch")
+async def fetch_requirements_batch(request: BatchRequestData):
+    errors, keys = {}, {}
+    for country in request.countries:
+        scraper = resolve(country)
+        if scraper is None:
+            errors[country] = f"Scraper not available for '{country}' yet."
         else:
-            return {"error": f"Scraper not available for '{country}' yet."}
+            keys.setdefault(scraper.key, country)
 
-    except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+    # Cancelling a slow lookup only drops this request's wait: the shared load
+    # is shielded, keeps going for other waiters and lands in the cache.
+    tasks = {key: asyncio.create_task(requirements_for(key)) for key in keys}
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=BATCH_TIMEOUT)
+    results, timed_out = {}, []
+    for key, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            timed_out.append(key)
+        elif "error" in task.result():
+            errors[keys[key]] = task.result()["error"]
+        else:
+            results[key] = task.result()
+
+    response = {
+        # Requirements aren't nationality-specific yet; echoed for the client.
+        "nationality": request.nationality,
+        "results": results,
+        "errors": errors,
+        "timed_out": timed_out,
+    }
+    if request.compare:
+        response["comparison"] = compare_documents(results)
+    return response
+
+# === ROUTE: /api/knowledge ===
+# Curated requirements straight from memory: no cache, scraper or LLM involved.
+
+@app.get("/api/knowledge")
+def get_knowledge(country: str = Query(...), visa_type: str = Query(None)):
+    scraper = resolve(country)
+    payload = knowledge_base.payload(scraper.key, visa_type) if scraper is not None else None
+    if payload is None:
+        return {"error": f"No curated requirements for '{country}'" + (f" ({visa_type})." if visa_type else ".")}
+    return payload
+
+# === ROUTE: /api/research ===
+# Deep-research lookups take minutes, so they run as jobs: submit, poll the
+# status, then fetch the result. Identical requests share a job or a stored result.
+
+@app.post("/api/research")
+async def submit_research(request: ResearchRequest):
+    job, coalesced = await research_jobs.submit(request.country, request.nationality)
+    return {**job.view(), "coalesced": coalesced}
+
+@app.get("/api/research/{job_id}")
+def get_research_status(job_id: str):
+    job = research_jobs.get(job_id)
+    if job is None:
+        return {"error": f"Unknown or expired research job '{job_id}'."}
+    return job.view()
+
+@app.get("/api/research/{job_id}/result")
+def get_research_result(job_id: str):
+    job = research_jobs.get(job_id)
+    if job is None:
+        return {"error": f"Unknown or expired research job '{job_id}'."}
+    if job.status != "done":
+        return {"error": job.error or f"Research job is still {job.status}.", "status": job.status}
+    return job.result
+
+# === ROUTE: /api/requirements/history ===
+
+@app.get("/api/requirements/history")
+def get_requirements_history(country: str = Query(...), limit: int = Query(20, ge=1, le=200)):
+    scraper = resolve(country)
+    if scraper is None:
+        return {"error": f"Scraper not available for '{country}' yet."}
+    key = scraper.key
+    if requirements_cache.store is None:
+        return {"error": "Snapshot store is disabled."}
+    return {"country": key, "versions": requirements_cache.store.history(key, limit)}
+
+@app.get("/api/requirements/diff")
+def get_requirements_diff(country: str = Query(...), from_id: int = Query(None), to_id: int = Query(None)):
+    scraper = resolve(country)
+    if scraper is None:
+        return {"error": f"Scraper not available for '{country}' yet."}
+    key = scraper.key
+    if requirements_cache.store is None:
+        return {"error": "Snapshot store is disabled."}
+    if (from_id is None) != (to_id is None):
+        return {"error": "Pass both from_id and to_id, or neither."}
+    diff = requirements_cache.store.diff(key, from_id, to_id)
+    if diff is None and from_id is not None:
+        return {"error": f"Snapshots {from_id} and {to_id} are not both versions of '{key}'."}
+    if diff is None:
+        return {"error": f"Not enough snapshot history for '{key}' to diff."}
+    return diff
+
+# === ROUTE: /api/plan ===
+# Roadmap and visa requirements in one round trip; the LLM call and the
+# requirement lookup run concurrently.
+
+@app.post("/api/plan")
+async def generate_plan(profile: UserProfile):
+    roadmap, requirements = await asyncio.gather(
+        generate_roadmap_data(profile),
+        requirements_for(profile.targetCountry),
+    )
+    return {**roadmap, "requirements": requirements}
+
+@app.post("/api/plan/stream")
+async def generate_plan_stream(profile: UserProfile):
+    # NDJSON like /generate-roadmap/stream, plus a "requirements" field emitted
+    # whenever the lookup finishes, an {"error": ...} line if either side failed,
+    # then a single {"done": true}.
+    queue = asyncio.Queue()
+
+    async def produce_roadmap():
+        async for event in stream_roadmap_events(profile):
+            if not event.get("done"):
+                await queue.put(event)
+
+    async def produce_requirements():
+        value = await requirements_for(profile.targetCountry)
+        await queue.put({"field": "requirements", "value": value})
+
+    async def lines():
+        producers = [asyncio.create_task(produce_roadmap()), asyncio.create_task(produce_requirements())]
+        # return_exceptions: one failing producer doesn't cut the other short.
+        waiter = asyncio.ensure_future(asyncio.gather(*producers, return_exceptions=True))
+        try:
+            while not (waiter.done() and queue.empty()):
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield json.dumps(getter.result()) + "\n"
+                else:
+                    getter.cancel()
+            for result in waiter.result():
+                if isinstance(result, Exception):
+                    yield json.dumps({"error": str(result) or type(result).__name__}) + "\n"
+            yield json.dumps({"done": True}) + "\n"
+        finally:
+            for task in producers:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,172 @@
+# In-process metrics for the hot paths (scraper stages, LLM calls, caches,
+# fallbacks), rendered in the Prometheus text format at /metrics. Dependency
+# free on purpose; METRICS_ENABLED=0 turns every observation into a no-op and
+# METRICS_LOG=1 additionally prints one JSON line per event.
+import contextvars
+import json
+import os
+import threading
+import time
+
+ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+LOG_EVENTS = ENABLED and os.getenv("METRICS_LOG", "0") == "1"
+PREFIX = "japa_"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Set per HTTP request by the middleware in backend/main.py so log lines from
+# the scrapers and the LLM client can be tied back to the request.
+request_id = contextvars.ContextVar("request_id", default=None)
+
+_metrics = []
+_collectors = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = PREFIX + name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        if not ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = PREFIX + name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value: float, **labels):
+        if not ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[len(self.buckets)] += 1
+            counts[-1] += value
+
+    def render(self):
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, key)} {_number(counts[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, key)} {cumulative}"
+
+
+def collector(func):
+    # Registers a function called at scrape time that yields
+    # (name, kind, help, {labels}, value) for state owned elsewhere (cache sizes).
+    _collectors.append(func)
+    return func
+
+
+def log_event(event: str, **fields):
+    if not LOG_EVENTS:
+        return
+    record = {"ts": round(time.time(), 3), "event": event}
+    rid = request_id.get()
+    if rid is not None:
+        record["request_id"] = rid
+    record.update(fields)
+    print(json.dumps(record, default=str), flush=True)
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+
+    # Samples of one family must be contiguous, whatever order collectors yield them in.
+    families = {}
+    for func in _collectors:
+        try:
+            samples = list(func())
+        except Exception as e:
+            print(f"[ERROR] Metrics collector {func.__name__} failed: {e}")
+            continue
+        for name, kind, help, labels, value in samples:
+            name = PREFIX + name
+            family = families.setdefault(name, [f"# HELP {name} {help}", f"# TYPE {name} {kind}"])
+            family.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+    for family in families.values():
+        lines.extend(family)
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to produce the response headers, by route.", ("method", "route", "status"))
+SCRAPE_STAGE_SECONDS = Histogram(
+    "scrape_stage_duration_seconds", "Time spent in each scraper stage.", ("stage",))
+SCRAPE_RESULTS = Counter(
+    "scrape_results_total", "Scraper runs by outcome (scraped, unchanged, fallback, error).", ("country", "outcome"))
+STATIC_FETCHES = Counter(
+    "static_fetch_total", "Plain HTTP page fetches by result (modified, not_modified).", ("result",))
+PREFETCH_RUNS = Counter(
+    "prefetch_runs_total", "Background refreshes by outcome (scraped, fallback, error).", ("country", "outcome"))
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total", "Requests turned away by admission control.", ("group", "reason"))
+RESEARCH_JOBS = Counter(
+    "research_jobs_total", "Deep-research submissions and job outcomes (submitted, coalesced, stored, done, failed).",
+    ("outcome",))
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Wall time of chat.completions.create, including the streamed body.",
+    ("model", "mode", "outcome"))
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "llm_time_to_first_token_seconds", "Time until the first streamed content delta.", ("model",))
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens reported by the API usage block.", ("model", "kind"))
@@ -0,0 +1,88 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+# === DATA MODELS ===
+
+class UserProfile(BaseModel):
+    fullName: str
+    degree: str
+    workExperience: str
+    targetCountry: str
+    goal: str
+
+class RequestData(BaseModel):
+    country: str
+    nationality: str = "Nigeria"
+
+# === RESPONSE MODELS ===
+# Mirrors the JSON shape /generate-roadmap returns; also used to build the
+# structured-output schema sent to the model.
+
+OPPORTUNITY_TYPES = ("scholarship", "university", "visa", "other")
+
+def _text(value) -> str:
+    # Scalars become strings; anything else (null, lists, objects) is dropped.
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return ""
+
+class Opportunity(BaseModel):
+    title: str = ""
+    url: str = ""
+    type: Literal["scholarship", "university", "visa", "other"] = "other"
+
+    @field_validator("title", "url", mode="before")
+    @classmethod
+    def coerce_text(cls, value):
+        return _text(value)
+
+    @field_validator("type", mode="before")
+    @classmethod
+    def coerce_type(cls, value):
+        value = str(value or "").strip().lower()
+        return value if value in OPPORTUNITY_TYPES else "other"
+
+class RoadmapResponse(BaseModel):
+    roadmap: str = ""
+    checklist: List[str] = []
+    sop: str = ""
+    opportunities: List[Opportunity] = []
+
+    # Model output is repaired rather than rejected: a wrongly shaped field or
+    # item is coerced or dropped so the rest of the roadmap still gets through.
+    @field_validator("roadmap", "sop", mode="before")
+    @classmethod
+    def coerce_text(cls, value):
+        return _text(value)
+
+    @field_validator("checklist", mode="before")
+    @classmethod
+    def coerce_checklist(cls, value):
+        if isinstance(value, str):
+            value = value.splitlines()
+        if not isinstance(value, list):
+            return []
+        items = (_text(item).strip().lstrip("-*• ").strip() for item in value)
+        return [item for item in items if item]
+
+    @field_validator("opportunities", mode="before")
+    @classmethod
+    def coerce_opportunities(cls, value):
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            return []
+        return [item for item in value if isinstance(item, dict)]
+
+class ResearchRequest(BaseModel):
+    country: str
+    nationality: str = "Nigeria"
+
+class BatchRequestData(BaseModel):
+    countries: List[str] = Field(..., min_length=1, max_length=10)
+    nationality: str = "Nigeria"
+    # Add a shared vs country-specific document breakdown to the response.
+    compare: bool = False
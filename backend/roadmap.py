@@ -0,0 +1,332 @@
+# Roadmap generation against the OpenAI chat completions API, in both a
+# whole-response and a streamed, field-by-field form.
+import json
+import os
+import threading
+import time
+
+from backend import metrics
+from backend.json_repair import repair_json
+from backend.json_stream import TopLevelFieldParser
+from backend.models import RoadmapResponse, UserProfile
+from backend.roadmap_cache import roadmap_cache
+
+MODEL = os.getenv("ROADMAP_MODEL", "gpt-4o-mini")
+# Completion budget per roadmap; 0 (the default) leaves it to the model. A cap
+# that cuts roadmaps short costs their content and their roadmap cache entry,
+# so check the "truncated" count on /generate-roadmap/usage before setting one.
+MAX_TOKENS = int(os.getenv("ROADMAP_MAX_TOKENS", "0"))
+# Ask the API to enforce the RoadmapResponse schema (json_schema response format).
+STRUCTURED_OUTPUT = os.getenv("ROADMAP_STRUCTURED_OUTPUT", "1") == "1"
+
+_client = None
+
+
+def get_client():
+    # Created on first use so .env has been loaded (and the openai package, the
+    # slowest import in the app, stays off the startup path); OPENAI_BASE_URL
+    # lets tests point this at a local mock server (see backend/dev/mock_openai.py).
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL") or None)
+    return _client
+
+
+# Everything that is the same for every user goes in the system message, ahead
+# of the profile, so the provider can reuse the prefix across requests (OpenAI
+# caches identical prompt prefixes once they pass 1024 tokens).
+SYSTEM_PROMPT = """You are an expert immigration and education advisor. Nigerian users submit their profile and you plan their move abroad.
+
+Return a structured JSON object with 4 fields:
+
+1. "roadmap": A short paragraph explaining the steps this person should take to move to their target country.
+2. "checklist": A JSON list of 5–7 bullet points with practical steps and documents.
+3. "sop": A formal academic-style Statement of Purpose based on their background and goal.
+4. "opportunities": A list of 3–5 relevant links to scholarship, visa, or university resources for the target country. Each item should include:
+   - "title": short name of the opportunity
+   - "url": a valid link (you can use placeholders if needed)
+   - "type": one of ["scholarship", "university", "visa", "other"]
+
+Return ONLY a valid JSON object like this:
+{
+  "roadmap": "...",
+  "checklist": ["...", "..."],
+  "sop": "...",
+  "opportunities": [
+    {
+      "title": "...",
+      "url": "...",
+      "type": "scholarship"
+    },
+    ...
+  ]
+}
+
+Do not include any explanations, formatting, or markdown — only valid JSON."""
+
+
+def build_prompt(profile: UserProfile) -> str:
+    # The per-user suffix: only the profile fields.
+    return f"""Profile:
+- Name: {profile.fullName}
+- Degree: {profile.degree}
+- Work Experience: {profile.workExperience}
+- Target Country: {profile.targetCountry}
+- Career/Education Goal: {profile.goal}"""
+
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    # Exact with tiktoken when it is installed, otherwise the usual ~4
+    # characters per token estimate.
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            try:
+                _encoding = tiktoken.encoding_for_model(MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+class TokenUsage:
+    # Running totals for the /generate-roadmap/usage report.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.estimated_prompt_tokens = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        # Completions that stopped at the token limit (finish_reason "length").
+        self.truncated = 0
+        self._prefix_tokens = None
+
+    def prefix_tokens(self) -> int:
+        if self._prefix_tokens is None:
+            self._prefix_tokens = count_tokens(SYSTEM_PROMPT)
+        return self._prefix_tokens
+
+    def record(self, estimated: int, usage=None, truncated: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.truncated += truncated
+            self.estimated_prompt_tokens += estimated
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens
+                self.completion_tokens += usage.completion_tokens
+                self.cached_prompt_tokens += cached_tokens(usage)
+
+    def report(self) -> dict:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "model": MODEL,
+                "max_tokens": MAX_TOKENS or None,
+                "token_counter": "tiktoken" if _encoding else "estimate",
+                "static_prefix_tokens": self.prefix_tokens(),
+                "calls": self.calls,
+                "truncated": self.truncated,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "mean_estimated_prompt_tokens": round(self.estimated_prompt_tokens / calls, 1),
+                "mean_prompt_tokens": round(self.prompt_tokens / calls, 1),
+                "mean_completion_tokens": round(self.completion_tokens / calls, 1),
+                "cached_ratio": round(self.cached_prompt_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+            }
+
+
+def cached_tokens(usage) -> int:
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+
+
+token_usage = TokenUsage()
+
+
+def _strict_schema(schema: dict) -> dict:
+    # Structured outputs in strict mode need every property required and no
+    # additional properties, on every object in the schema.
+    schema = {key: value for key, value in schema.items() if key not in ("default", "title")}
+    if "properties" in schema:
+        schema["properties"] = {name: _strict_schema(prop) for name, prop in schema["properties"].items()}
+        schema["required"] = list(schema["properties"])
+        schema["additionalProperties"] = False
+    if "items" in schema:
+        schema["items"] = _strict_schema(schema["items"])
+    if "$defs" in schema:
+        schema["$defs"] = {name: _strict_schema(definition) for name, definition in schema["$defs"].items()}
+    return schema
+
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "roadmap_response",
+        "strict": True,
+        "schema": _strict_schema(RoadmapResponse.model_json_schema()),
+    },
+}
+
+
+def completion_options() -> dict:
+    options = {"response_format": RESPONSE_FORMAT} if STRUCTURED_OUTPUT else {}
+    if MAX_TOKENS:
+        options["max_tokens"] = MAX_TOKENS
+    return options
+
+
+def parse_roadmap(text: str):
+    # Returns (validated dict, complete) or (None, False). Falls back to local
+    # repair so fenced or truncated output doesn't cost a second generation.
+    truncated = False
+    try:
+        data = json.loads(text)
+    except (TypeError, json.JSONDecodeError):
+        data, truncated = repair_json(text)
+    if not isinstance(data, dict):
+        return None, False
+    complete = not truncated and all(field in data for field in RoadmapResponse.model_fields)
+    return RoadmapResponse.model_validate(data).model_dump(), complete
+
+
+def validate_field(field: str, value):
+    return RoadmapResponse.model_validate({field: value}).model_dump()[field]
+
+
+def estimate_prompt_tokens(messages: list) -> int:
+    # The system message is the shared prefix, counted once per process.
+    return token_usage.prefix_tokens() + sum(count_tokens(m["content"]) for m in messages[1:])
+
+
+def record_llm_call(mode: str, started: float, outcome: str, usage=None, estimated: int = 0, finish_reason: str = None):
+    elapsed = time.perf_counter() - started
+    # A completion cut off at the token limit is recorded as its own outcome.
+    if outcome == "ok" and finish_reason == "length":
+        outcome = "truncated"
+    metrics.LLM_REQUEST_SECONDS.observe(elapsed, model=MODEL, mode=mode, outcome=outcome)
+    token_usage.record(estimated, usage, truncated=outcome == "truncated")
+    fields = {"estimated_prompt_tokens": estimated, "finish_reason": finish_reason}
+    if usage is not None:
+        fields.update(prompt_tokens=usage.prompt_tokens, cached_prompt_tokens=cached_tokens(usage),
+                      completion_tokens=usage.completion_tokens)
+        metrics.LLM_TOKENS.inc(usage.prompt_tokens, model=MODEL, kind="prompt")
+        metrics.LLM_TOKENS.inc(cached_tokens(usage), model=MODEL, kind="cached_prompt")
+        metrics.LLM_TOKENS.inc(usage.completion_tokens, model=MODEL, kind="completion")
+    metrics.log_event("llm_call", model=MODEL, mode=mode, outcome=outcome, seconds=round(elapsed, 4), **fields)
+
+
+def build_messages(profile: UserProfile) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_prompt(profile)}
+    ]
+
+
+async def generate_roadmap_data(profile: UserProfile) -> dict:
+    cached = roadmap_cache.get(profile)
+    if cached is not None:
+        return cached
+
+    response = message = None
+    messages = build_messages(profile)
+    estimated = estimate_prompt_tokens(messages)
+    started = time.perf_counter()
+    try:
+        response = await get_client().chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            **completion_options()
+        )
+        record_llm_call("complete", started, "ok", response.usage, estimated, response.choices[0].finish_reason)
+        message = response.choices[0].message.content
+        data, complete = parse_roadmap(message)
+        if data is None:
+            return {"error": "Failed to parse GPT response", "raw": message}
+        if complete:
+            roadmap_cache.put(profile, data)
+        return data
+
+    except Exception as e:
+        if response is None:
+            record_llm_call("complete", started, "error", estimated=estimated)
+        return {"error": str(e)}
+
+
+async def stream_roadmap_events(profile: UserProfile):
+    # Yields one event per top-level JSON field as soon as its value is complete,
+    # then a final {"done": true}. Failures surface as an {"error": ...} event.
+    cached = roadmap_cache.get(profile)
+    if cached is not None:
+        for field, value in cached.items():
+            yield {"field": field, "value": value}
+        yield {"done": True}
+        return
+
+    parser = TopLevelFieldParser()
+    fields = {}
+    usage = finish_reason = None
+    messages = build_messages(profile)
+    estimated = estimate_prompt_tokens(messages)
+    started = time.perf_counter()
+    first_token = None
+    try:
+        stream = await get_client().chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **completion_options()
+        )
+        async for chunk in stream:
+            # With include_usage the last chunk carries usage and no choices.
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - started
+                metrics.LLM_FIRST_TOKEN_SECONDS.observe(first_token, model=MODEL)
+            for field, value in parser.feed(delta):
+                if field in RoadmapResponse.model_fields and field not in fields:
+                    fields[field] = validate_field(field, value)
+                    yield {"field": field, "value": fields[field]}
+
+    except Exception as e:
+        record_llm_call("stream", started, "error", usage, estimated)
+        yield {"error": str(e)}
+        return
+    record_llm_call("stream", started, "ok", usage, estimated, finish_reason)
+
+    # Fields the incremental parser couldn't close (truncated or malformed
+    # output) get one repair pass over the whole buffer.
+    try:
+        data, complete = parse_roadmap(parser.buffer)
+    except Exception as e:
+        yield {"error": f"Failed to parse GPT response: {e}", "raw": parser.buffer}
+        return
+    if data is None and not fields:
+        yield {"error": "Failed to parse GPT response", "raw": parser.buffer}
+        return
+    for field, value in (data or {}).items():
+        if field not in fields:
+            fields[field] = value
+            yield {"field": field, "value": value}
+    if complete:
+        roadmap_cache.put(profile, fields)
+    yield {"done": True}
@@ -0,0 +1,190 @@
+# Profile-keyed cache for generated roadmaps. Profiles that differ only in
+# fullName share an entry: the name is swapped for placeholders before storing
+# and the caller's name is substituted back in on a hit.
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = int(os.getenv("ROADMAP_CACHE_MAX_ENTRIES", "512"))
+MAX_BYTES = int(os.getenv("ROADMAP_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+TTL = int(os.getenv("ROADMAP_CACHE_TTL", str(7 * 24 * 60 * 60)))
+# Optional JSON file the cache is loaded from and written through to.
+CACHE_PATH = os.getenv("ROADMAP_CACHE_PATH", "")
+# Writes to CACHE_PATH are batched: one rewrite at most this often, on a timer
+# thread so the event loop never waits on the file.
+SAVE_DELAY = float(os.getenv("ROADMAP_CACHE_SAVE_DELAY", "5"))
+
+FULL_NAME = "{{FULL_NAME}}"
+FIRST_NAME = "{{FIRST_NAME}}"
+LAST_NAME = "{{LAST_NAME}}"
+
+FINGERPRINT_FIELDS = ("degree", "workExperience", "targetCountry", "goal")
+REQUIRED_FIELDS = ("roadmap", "checklist", "sop", "opportunities")
+
+
+def _normalize(value: str) -> str:
+    value = re.sub(r"\s+", " ", value.strip().lower())
+    return value.strip(" .,;:!")
+
+
+def fingerprint(profile) -> str:
+    raw = "\x1f".join(_normalize(getattr(profile, field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _name_parts(full_name: str):
+    parts = full_name.split()
+    if not parts:
+        return "", "", ""
+    return " ".join(parts), parts[0], parts[-1] if len(parts) > 1 else ""
+
+
+def _map_strings(value, func):
+    if isinstance(value, str):
+        return func(value)
+    if isinstance(value, list):
+        return [_map_strings(item, func) for item in value]
+    if isinstance(value, dict):
+        return {key: _map_strings(item, func) for key, item in value.items()}
+    return value
+
+
+def anonymize(data: dict, full_name: str) -> dict:
+    full, first, last = _name_parts(full_name)
+    replacements = [(part, token) for part, token in ((full, FULL_NAME), (first, FIRST_NAME), (last, LAST_NAME))
+                    if len(part) > 1]
+    if not replacements:
+        return data
+
+    def scrub(text: str) -> str:
+        for part, token in replacements:
+            text = re.sub(rf"\b{re.escape(part)}\b", token, text)
+        return text
+
+    return _map_strings(data, scrub)
+
+
+def personalize(data: dict, full_name: str) -> dict:
+    full, first, last = _name_parts(full_name)
+
+    def fill(text: str) -> str:
+        if "{{" not in text:
+            return text
+        return text.replace(FULL_NAME, full).replace(FIRST_NAME, first).replace(LAST_NAME, last or first)
+
+    return _map_strings(data, fill)
+
+
+class RoadmapCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES, ttl: int = TTL, path: str = CACHE_PATH,
+                 save_delay: float = SAVE_DELAY):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.save_delay = save_delay
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self.load()
+
+    def get(self, profile):
+        key = fingerprint(profile)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["stored_at"] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = entry["data"]
+        return personalize(data, profile.fullName)
+
+    def put(self, profile, data: dict):
+        if not isinstance(data, dict) or "error" in data or not all(field in data for field in REQUIRED_FIELDS):
+            return
+        key = fingerprint(profile)
+        entry = {"data": anonymize(data, profile.fullName), "stored_at": time.time()}
+        entry["size"] = len(json.dumps(entry["data"], ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry["size"]
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            if self.path and self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ERROR] Could not load roadmap cache from {self.path}: {e}")
+            return
+        with self._lock:
+            for key, entry in stored.items():
+                self._entries[key] = entry
+                self._bytes += entry.get("size", 0)
+
+    def flush(self):
+        # Writes out changes still waiting on the save timer (also run at shutdown).
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        self.save()
+
+    def save(self):
+        with self._lock:
+            snapshot = dict(self._entries)
+        tmp_path = f"{self.path}.tmp"
+        with self._save_lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"[ERROR] Could not persist roadmap cache to {self.path}: {e}")
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+
+
+roadmap_cache = RoadmapCache()
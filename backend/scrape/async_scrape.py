@@ -0,0 +1,88 @@
+# scrape/async_scrape.py
+# Coroutine entry points for the scrapers so async endpoints never block the
+# event loop: static pages go through httpx, browser scrapers run on a
+# dedicated executor. Concurrency is bounded per country and per host.
+# httpx is imported with the first client.
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from backend.scrape.conditional import page_validators
+from backend.scrape.page_loader import SourceSet, resolve_url
+from backend.scrape.registry import SCRAPERS
+from backend.scrape.requirements import HEADERS
+from backend.scrape.timing import stage
+
+PER_COUNTRY_LIMIT = int(os.getenv("SCRAPE_CONCURRENCY_PER_COUNTRY", "1"))
+PER_HOST_LIMIT = int(os.getenv("SCRAPE_CONCURRENCY_PER_HOST", "2"))
+EXECUTOR_WORKERS = int(os.getenv("SCRAPE_EXECUTOR_WORKERS", "4"))
+HTTP_TIMEOUT = float(os.getenv("SCRAPE_STATIC_TIMEOUT", "10"))
+
+_executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="scraper")
+_country_limits = {}
+_host_limits = {}
+_client = None
+
+
+def _limit(registry: dict, key: str, size: int) -> asyncio.Semaphore:
+    semaphore = registry.get(key)
+    if semaphore is None:
+        semaphore = registry[key] = asyncio.Semaphore(size)
+    return semaphore
+
+
+def get_async_client():
+    global _client
+    if _client is None:
+        import httpx
+
+        _client = httpx.AsyncClient(headers=HEADERS, timeout=HTTP_TIMEOUT, follow_redirects=True)
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_static_async(url: str):
+    import httpx
+
+    async with _limit(_host_limits, urlparse(url).netloc, PER_HOST_LIMIT):
+        try:
+            with stage("static_fetch"):
+                response = await get_async_client().get(resolve_url(url), headers=page_validators.request_headers(url))
+                if response.status_code == 304:
+                    text = page_validators.not_modified(url)
+                    if text is not None:
+                        return text
+                response.raise_for_status()
+            page_validators.store(url, response.headers, response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            print(f"[WARN] Source {url} unavailable: {e}")
+            return None
+
+
+async def run_in_executor(func, *args):
+    # Carry the request's context (request id for structured logs) into the worker.
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, context.run, func, *args)
+
+
+async def scrape_country(key: str):
+    scraper = SCRAPERS[key]
+    async with _limit(_country_limits, key, PER_COUNTRY_LIMIT):
+        if scraper.static:
+            htmls = await asyncio.gather(*(fetch_static_async(source.url) for source in scraper.sources))
+            # Parsing and normalization are CPU-bound; keep them off the event loop.
+            return await run_in_executor(scraper.run, SourceSet.prefetched(scraper.sources, list(htmls)))
+
+        host = urlparse(scraper.sources[0].url).netloc
+        async with _limit(_host_limits, host, PER_HOST_LIMIT):
+            return await run_in_executor(scraper.scrape)
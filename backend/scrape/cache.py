@@ -0,0 +1,199 @@
+# scrape/cache.py
+# Per-country cache for scraper results with stale-while-revalidate and
+# single-flight loading, so concurrent lookups share one Selenium session.
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from backend.scrape.snapshots import open_default_store
+
+DEFAULT_TTL = int(os.getenv("REQUIREMENTS_CACHE_TTL", str(24 * 60 * 60)))
+# Payloads older than this are not served at all and force a blocking reload.
+DEFAULT_MAX_STALE = int(os.getenv("REQUIREMENTS_CACHE_MAX_STALE", str(30 * 24 * 60 * 60)))
+
+
+class CacheEntry:
+    def __init__(self, value, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class RequirementsCache:
+    def __init__(self, ttl: int = DEFAULT_TTL, max_stale: int = DEFAULT_MAX_STALE, store=None):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.store = store
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def aget(self, key: str, loader):
+        # Fresh entries are served as is; stale ones are served while a refresh
+        # runs behind the scenes; missing or too old ones wait for a load. The
+        # loader is a coroutine function. Loads run in their own task and each
+        # caller's wait is shielded, so a cancelled request drops only its own
+        # wait, not the load or the other waiters.
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                self.hits += 1
+                return entry.value
+            if age < self.max_stale:
+                self.stale_hits += 1
+                self.arefresh(key, loader)
+                return entry.value
+
+        self.misses += 1
+        return await wait_for_load(self.arefresh(key, loader))
+
+    def arefresh(self, key: str, loader):
+        future, owner = self._claim(key)
+        if owner:
+            task = asyncio.get_running_loop().create_task(self._aload(key, loader, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return future
+
+    def set(self, key: str, value, fetched_at: float = None):
+        self._entries[key] = CacheEntry(value, fetched_at if fetched_at is not None else time.time())
+
+    def warm(self) -> int:
+        # Load the last known good snapshot per country so a fresh process can
+        # answer immediately; entries keep their original age for TTL checks.
+        if self.store is None:
+            return 0
+        snapshots = self.store.latest_all()
+        for key, (payload, checked_at) in snapshots.items():
+            if key not in self._entries:
+                self.set(key, payload, fetched_at=checked_at)
+        return len(snapshots)
+
+    def sync(self) -> int:
+        # Pick up snapshots another process (the prefetch worker) has written
+        # since the last look; returns how many entries changed.
+        if self.store is None:
+            return 0
+        updated = 0
+        for key, (payload, checked_at) in self.store.latest_all().items():
+            entry = self._entries.get(key)
+            if entry is None or checked_at > entry.fetched_at:
+                self.set(key, payload, fetched_at=checked_at)
+                updated += 1
+        return updated
+
+    def lookup(self, key: str):
+        # Counted read for callers that serve any age and never load (the
+        # prefetch request path); peek() is the uncounted version.
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.age() < self.ttl:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry.value
+
+    def peek(self, key: str):
+        entry = self._entries.get(key)
+        return entry.value if entry else None
+
+    def age(self, key: str):
+        entry = self._entries.get(key)
+        return entry.age() if entry else None
+
+    def inflight(self, key: str):
+        with self._lock:
+            return self._inflight.get(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def invalidate(self, key: str = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _claim(self, key: str):
+        # Returns the in-flight future for key and whether the caller must run the load.
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    async def _aload(self, key: str, loader, future: Future):
+        try:
+            value = await loader()
+            cacheable = self._cacheable(key, value)
+            if cacheable and self.store is not None:
+                # SQLite may wait on the prefetch worker's lock; keep that off the loop.
+                await asyncio.to_thread(self._persist, key, value)
+        except BaseException as e:
+            self._fail(key, future, e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        self._resolve(key, future, value, cacheable)
+
+    def _fail(self, key: str, future: Future, error: BaseException):
+        print(f"[ERROR] Failed to load requirements for '{key}': {error}")
+        with self._lock:
+            self._inflight.pop(key, None)
+        if not future.done():
+            future.set_exception(error)
+
+    def _cacheable(self, key: str, value) -> bool:
+        if not isinstance(value, dict) or "error" in value:
+            return False
+        if value.get("used_fallback"):
+            # A fallback never replaces a live scrape, in memory or in history;
+            # the live entry keeps its age so the next refresh retries.
+            current = self._entries.get(key)
+            if current is not None and not current.value.get("used_fallback"):
+                return False
+        return True
+
+    def _persist(self, key: str, value):
+        try:
+            self.store.save(key, value)
+        except Exception as e:
+            print(f"[ERROR] Failed to persist snapshot for '{key}': {e}")
+
+    def _resolve(self, key: str, future: Future, value, cacheable: bool):
+        with self._lock:
+            if cacheable:
+                self._entries[key] = CacheEntry(value, time.time())
+            self._inflight.pop(key, None)
+        if not future.done():
+            future.set_result(value)
+
+
+async def wait_for_load(future: Future):
+    # Await a shared load without letting this caller's cancellation reach it.
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+requirements_cache = RequirementsCache(store=open_default_store())
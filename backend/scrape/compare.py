@@ -0,0 +1,58 @@
+# scrape/compare.py
+# Document comparison across countries for the batch requirements endpoint.
+# Each country words its checklist differently, so documents are matched on a
+# small set of categories before falling back to the normalized text itself.
+import re
+
+# Patterns compiled once at import; first match wins, so order specific to general.
+DOCUMENT_CATEGORIES = [
+    (re.compile(pattern, re.IGNORECASE), category) for pattern, category in [
+        (r'photo|biometric', "Photographs or biometrics"),
+        (r'passport|travel document|reisepass', "Valid passport"),
+        (r'\bcas\b|i-20|admission|acceptance|zulassung|enrol', "Admission or acceptance letter"),
+        (r'financ|funds|money|blocked account|bank statement', "Proof of financial support"),
+        (r'ielts|toefl|celpip|english|language', "Language test results"),
+        (r'health insurance|krankenversicherung|healthcare surcharge', "Health insurance or surcharge"),
+        (r'transcript|diploma|academic|qualification|zeugnis', "Academic transcripts and qualifications"),
+        (r'tuberculosis|\btb\b|medical', "Medical examination"),
+        (r'\bfee\b|fees|i-901|payment|gebühr', "Visa or application fee"),
+        (r'ds-160|application form|antragsformular', "Completed application form"),
+    ]
+]
+NON_WORD_RE = re.compile(r'[^\w\s]')
+SPACE_RE = re.compile(r'\s+')
+
+
+def document_key(document: str) -> str:
+    for pattern, category in DOCUMENT_CATEGORIES:
+        if pattern.search(document):
+            return category
+    return SPACE_RE.sub(" ", NON_WORD_RE.sub(" ", document.lower())).strip()
+
+
+def compare_documents(payloads: dict) -> dict:
+    # payloads maps country key -> requirements payload. "shared" lists the
+    # categories every country asks for (with each country's own wording),
+    # "specific" the documents only some countries list.
+    by_country = {}
+    for key, payload in payloads.items():
+        keyed = {}
+        for document in payload.get("documents") or []:
+            keyed.setdefault(document_key(document), []).append(document)
+        by_country[key] = keyed
+
+    countries = list(by_country)
+    shared_keys = set.intersection(*(set(keyed) for keyed in by_country.values())) if by_country else set()
+    # Keep the first country's order so the output is stable.
+    ordered = [k for k in by_country[countries[0]] if k in shared_keys] if countries else []
+    return {
+        "countries": countries,
+        "shared": [
+            {"document": k, "by_country": {key: by_country[key][k] for key in countries}}
+            for k in ordered
+        ],
+        "specific": {
+            key: [doc for k, docs in keyed.items() if k not in shared_keys for doc in docs]
+            for key, keyed in by_country.items()
+        },
+    }
@@ -0,0 +1,60 @@
+# scrape/conditional.py
+# Validators (ETag / Last-Modified) and body of the last good response per
+# official page, so refreshes send conditional GETs and reuse the stored body
+# on 304 Not Modified instead of downloading the page again.
+import os
+import threading
+
+from backend import metrics
+
+CONDITIONAL_GET = os.getenv("SCRAPE_CONDITIONAL_GET", "1") == "1"
+
+
+class PageValidators:
+    # One entry per URL; the scrapers only ever hit a handful of fixed pages.
+    def __init__(self, enabled: bool = CONDITIONAL_GET):
+        self.enabled = enabled
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def request_headers(self, url: str) -> dict:
+        if not self.enabled:
+            return {}
+        with self._lock:
+            page = self._pages.get(url)
+        if page is None:
+            return {}
+        headers = {}
+        if page["etag"]:
+            headers["If-None-Match"] = page["etag"]
+        if page["last_modified"]:
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def store(self, url: str, response_headers, text: str):
+        # Works with both requests and httpx header mappings (case-insensitive).
+        metrics.STATIC_FETCHES.inc(result="modified")
+        if not self.enabled:
+            return
+        etag, last_modified = response_headers.get("etag"), response_headers.get("last-modified")
+        with self._lock:
+            if etag or last_modified:
+                self._pages[url] = {"etag": etag, "last_modified": last_modified, "text": text}
+            else:
+                self._pages.pop(url, None)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def not_modified(self, url: str):
+        # Body to serve for a 304; None if we never stored one (shouldn't happen).
+        with self._lock:
+            page = self._pages.get(url)
+        if page is None:
+            return None
+        metrics.STATIC_FETCHES.inc(result="not_modified")
+        return page["text"]
+
+
+page_validators = PageValidators()
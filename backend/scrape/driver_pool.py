@@ -0,0 +1,133 @@
+# scrape/driver_pool.py
+# Bounded pool of warm headless Chrome sessions shared by the Selenium scrapers.
+# Selenium and webdriver_manager are imported when the first browser launches.
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.scrape.timing import stage
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+POOL_SIZE = int(os.getenv("CHROME_POOL_SIZE", "2"))
+MAX_PAGES_PER_DRIVER = int(os.getenv("CHROME_POOL_MAX_PAGES", "50"))
+CHECKOUT_TIMEOUT = float(os.getenv("CHROME_POOL_CHECKOUT_TIMEOUT", "60"))
+
+
+def chrome_options():
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f"user-agent={USER_AGENT}")
+    return options
+
+
+class PooledDriver:
+    # Thin wrapper that counts page loads so the pool knows when to recycle.
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def get(self, url: str):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class DriverPool:
+    def __init__(self, max_size: int = POOL_SIZE, max_pages: int = MAX_PAGES_PER_DRIVER,
+                 checkout_timeout: float = CHECKOUT_TIMEOUT):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        # Caps live browsers (idle + checked out) so concurrent scrapes can't OOM the box.
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._driver_path = None
+        self._closed = False
+
+    @contextmanager
+    def driver(self):
+        with stage("browser_checkout"):
+            if not self._slots.acquire(timeout=self.checkout_timeout):
+                raise TimeoutError(f"No browser available within {self.checkout_timeout}s")
+        try:
+            pooled = self._checkout()
+            try:
+                yield pooled
+            except BaseException:
+                # The session may be mid-navigation or crashed; never hand it out again.
+                self._discard(pooled)
+                raise
+            self._return(pooled)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"max_size": self.max_size, "idle": len(self._idle)}
+
+    def _checkout(self) -> PooledDriver:
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                return PooledDriver(self._launch())
+            if self._healthy(pooled):
+                return pooled
+            self._discard(pooled)
+
+    def _return(self, pooled: PooledDriver):
+        if pooled.pages >= self.max_pages or not self._healthy(pooled):
+            self._discard(pooled)
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append(pooled)
+                return
+        self._discard(pooled)
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        with stage("browser_start"):
+            if self._driver_path is None:
+                # Resolving the driver hits the network; do it once per process.
+                self._driver_path = ChromeDriverManager().install()
+            return webdriver.Chrome(service=Service(self._driver_path), options=chrome_options())
+
+    @staticmethod
+    def _healthy(pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"[ERROR] Failed to quit Chrome session: {e}")
+
+
+driver_pool = DriverPool()
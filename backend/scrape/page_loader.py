@@ -0,0 +1,184 @@
+# scrape/page_loader.py
+# Readiness-based page loading: wait for the element we actually parse instead
+# of sleeping, and skip the browser entirely when the static HTML already has it.
+# requests, lxml and Selenium are imported on first use to keep API startup fast.
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.scrape.conditional import page_validators
+from backend.scrape.driver_pool import USER_AGENT, driver_pool
+from backend.scrape.timing import stage
+
+PAGE_LOAD_TIMEOUT = float(os.getenv("SCRAPE_PAGE_TIMEOUT", "15"))
+STATIC_FETCH_TIMEOUT = float(os.getenv("SCRAPE_STATIC_TIMEOUT", "10"))
+# Try a plain HTTP GET first and only launch Chrome if the content is missing.
+STATIC_FIRST = os.getenv("SCRAPE_STATIC_FIRST", "1") == "1"
+# Fetch every source of a country at once instead of primary-then-secondary.
+PARALLEL_SOURCES = os.getenv("SCRAPE_PARALLEL_SOURCES", "1") == "1"
+SOURCE_TIMEOUT = float(os.getenv("SCRAPE_SOURCE_TIMEOUT", "30"))
+# Serve every official page from a local stand-in instead, e.g. the benchmark
+# fixture server: https://host/path becomes {SCRAPE_URL_BASE}/host/path.
+URL_BASE = os.getenv("SCRAPE_URL_BASE", "").rstrip("/")
+
+_source_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCRAPE_SOURCE_WORKERS", "4")), thread_name_prefix="source-fetch"
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+# A page to fetch for a country, in priority order. static_only skips the browser.
+Source = namedtuple("Source", ["url", "ready_xpath", "static_only", "timeout"], defaults=[None, False, SOURCE_TIMEOUT])
+
+
+def resolve_url(url: str) -> str:
+    if not URL_BASE:
+        return url
+    return f"{URL_BASE}/{url.split('://', 1)[-1]}"
+
+
+def get_session():
+    # One keep-alive connection pool for every static fetch in the process.
+    import requests
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers["User-Agent"] = USER_AGENT
+            adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=_source_executor._max_workers)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def get_conditional(url: str, timeout: float = STATIC_FETCH_TIMEOUT):
+    # Returns (response, text). response is None when the server answered 304 and
+    # text is the body stored with the validators; callers store a 200 once accepted.
+    response = get_session().get(resolve_url(url), headers=page_validators.request_headers(url), timeout=timeout)
+    if response.status_code == 304:
+        text = page_validators.not_modified(url)
+        if text is not None:
+            return None, text
+    return response, response.text
+
+
+def load_page(driver, url: str, ready_xpath: str = None, timeout: float = PAGE_LOAD_TIMEOUT) -> str:
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with stage("page_load"):
+        driver.get(resolve_url(url))
+        if ready_xpath:
+            try:
+                WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.XPATH, ready_xpath))
+                )
+            except TimeoutException:
+                # Parse whatever rendered; the scraper's own fallback handles gaps.
+                print(f"[WARN] Timed out after {timeout}s waiting for content on {url}")
+        return driver.page_source
+
+
+def fetch_static(url: str, ready_xpath: str = None, timeout: float = STATIC_FETCH_TIMEOUT):
+    import lxml.html
+
+    with stage("static_fetch"):
+        response, text = get_conditional(url, timeout)
+        if response is None:
+            # Unchanged since it last passed the readiness check.
+            return text
+        if response.status_code != 200:
+            return None
+        if ready_xpath and not lxml.html.fromstring(response.content).xpath(ready_xpath):
+            return None
+        page_validators.store(url, response.headers, text)
+        return text
+
+
+def fetch_html(url: str, ready_xpath: str = None, timeout: float = PAGE_LOAD_TIMEOUT,
+               static_first: bool = STATIC_FIRST) -> str:
+    import requests
+
+    if static_first:
+        try:
+            html = fetch_static(url, ready_xpath)
+            if html:
+                return html
+        except requests.RequestException as e:
+            print(f"[WARN] Static fetch failed for {url}: {e}")
+
+    with driver_pool.driver() as driver:
+        return load_page(driver, url, ready_xpath, timeout)
+
+
+def fetch_source(source: Source):
+    if source.static_only:
+        with stage("static_fetch"):
+            response, text = get_conditional(source.url)
+            if response is not None:
+                response.raise_for_status()
+                page_validators.store(source.url, response.headers, text)
+            return text
+    return fetch_html(source.url, ready_xpath=source.ready_xpath)
+
+
+class SourceSet:
+    # In parallel mode all sources start downloading immediately, so a scraper
+    # that needs its secondary source pays max(latency) rather than the sum.
+    # Otherwise each source is fetched only when first asked for.
+    def __init__(self, sources: list, parallel: bool = PARALLEL_SOURCES):
+        self.sources = sources
+        self.parallel = parallel
+        self._results = {}
+        self._futures = {}
+        self._started = time.monotonic()
+        if parallel:
+            for index, source in enumerate(sources):
+                self._futures[index] = _source_executor.submit(fetch_source, source)
+
+    @classmethod
+    def prefetched(cls, sources: list, htmls: list):
+        # Wraps pages that were already downloaded (e.g. by the async client).
+        source_set = cls(sources, parallel=False)
+        source_set._results = dict(enumerate(htmls))
+        return source_set
+
+    def fingerprint(self):
+        # Hash over every source's HTML, or None when sources are fetched lazily
+        # (hashing would force downloads the scraper might not need).
+        if not self.parallel and len(self._results) < len(self.sources):
+            return None
+        digest = hashlib.sha256()
+        for index in range(len(self.sources)):
+            html = self.html(index)
+            digest.update(b"\x00" if html is None else html.encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    def html(self, index: int):
+        # Returns None when the source failed or missed its deadline.
+        if index in self._results:
+            return self._results[index]
+        source = self.sources[index]
+        try:
+            if index in self._futures:
+                remaining = source.timeout - (time.monotonic() - self._started)
+                html = self._futures[index].result(timeout=max(remaining, 0))
+            else:
+                html = fetch_source(source)
+        except Exception as e:
+            print(f"[WARN] Source {source.url} unavailable: {str(e) or type(e).__name__}")
+            html = None
+        self._results[index] = html
+        return html
+
+
+def fetch_sources(sources: list, parallel: bool = PARALLEL_SOURCES) -> SourceSet:
+    return SourceSet(sources, parallel)
@@ -0,0 +1,36 @@
+# scrape/parsing.py
+# Shared HTML parsing: the lxml tree builder when it is installed, and optional
+# SoupStrainer restriction so only the subtree a scraper reads is built.
+# bs4 is imported on first parse so the API process doesn't pay for it at startup.
+import importlib.util
+import os
+from functools import lru_cache
+
+from backend.scrape.timing import stage
+
+DEFAULT_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+HTML_PARSER = os.getenv("SCRAPE_HTML_PARSER", DEFAULT_PARSER)
+USE_STRAINERS = os.getenv("SCRAPE_SOUP_STRAINERS", "1") == "1"
+
+# Subtrees the scrapers actually search, as (tag, attribute) pairs turned into
+# SoupStrainers on first use; everything else is skipped at parse time.
+UK_MAIN = ("main", ())
+CANADA_DOCUMENTS = ("section", (("id", "get-documents"),))
+GERMANY_SECONDARY_CONTENT = ("div", (("id", "content"),))
+
+
+@lru_cache(maxsize=None)
+def strainer(only: tuple):
+    from bs4 import SoupStrainer
+
+    name, attrs = only
+    return SoupStrainer(name, attrs=dict(attrs))
+
+
+def make_soup(html: str, only: tuple = None, parser: str = None):
+    from bs4 import BeautifulSoup
+
+    with stage("parse"):
+        parse_only = strainer(only) if only and USE_STRAINERS else None
+        return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
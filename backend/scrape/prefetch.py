@@ -0,0 +1,174 @@
+# scrape/prefetch.py
+# Background refresh of every country's requirements so the request path only
+# ever reads the cache. Runs inside the API process (started from the lifespan
+# in backend/main.py) or as a standalone worker sharing the snapshot store:
+#
+#   python -m backend.scrape.prefetch            # refresh forever
+#   python -m backend.scrape.prefetch --once     # refresh everything once, e.g. from cron
+#
+# PREFETCH_MODE picks where scraping happens: "inline" (scheduler in the API
+# process), "external" (a separate worker; the API re-reads the snapshot store)
+# or "off" (scrape lazily on the request path, the pre-scheduler behaviour).
+import argparse
+import asyncio
+import os
+import random
+from functools import partial
+
+from backend import metrics
+from backend.scrape.async_scrape import scrape_country
+from backend.scrape.cache import requirements_cache, wait_for_load
+from backend.scrape.registry import SCRAPERS
+
+MODE = os.getenv("PREFETCH_MODE", "inline")
+INTERVAL = float(os.getenv("PREFETCH_INTERVAL", str(6 * 60 * 60)))
+# Each wait is scaled by a random factor in [1 - JITTER, 1 + JITTER].
+JITTER = float(os.getenv("PREFETCH_JITTER", "0.1"))
+# First refreshes after startup are spread evenly over this window.
+STAGGER = float(os.getenv("PREFETCH_STAGGER", "60"))
+CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+BACKOFF_BASE = float(os.getenv("PREFETCH_BACKOFF_BASE", "60"))
+BACKOFF_MAX = float(os.getenv("PREFETCH_BACKOFF_MAX", str(INTERVAL)))
+# How often the API process re-reads the snapshot store in "external" mode.
+SYNC_INTERVAL = float(os.getenv("PREFETCH_SYNC_INTERVAL", "60"))
+
+
+def jittered(seconds: float, jitter: float = JITTER) -> float:
+    return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+
+def backoff_delay(failures: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    return min(cap, base * 2 ** (failures - 1))
+
+
+class PrefetchScheduler:
+    def __init__(self, keys=None, cache=requirements_cache, interval: float = INTERVAL, stagger: float = STAGGER,
+                 concurrency: int = CONCURRENCY):
+        self.keys = list(keys or SCRAPERS)
+        self.cache = cache
+        self.interval = interval
+        self.stagger = stagger
+        self.concurrency = concurrency
+        self.failures = {key: 0 for key in self.keys}
+        self._tasks = []
+        self._slots = None
+
+    def start(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        spacing = self.stagger / max(len(self.keys), 1)
+        for index, key in enumerate(self.keys):
+            # A snapshot loaded from disk that is still recent pushes the first
+            # refresh back instead of re-scraping on every deploy.
+            age = self.cache.age(key)
+            due = self.interval - age if age is not None else 0.0
+            delay = max(index * spacing, due)
+            self._tasks.append(asyncio.create_task(self._loop(key, delay), name=f"prefetch-{key}"))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self) -> dict:
+        # Refreshes every key now (bounded concurrency) and reports outcomes.
+        self._slots = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(*(self.refresh(key) for key in self.keys))
+        return dict(zip(self.keys, outcomes))
+
+    async def refresh(self, key: str) -> str:
+        async with self._slots:
+            future = self.cache.arefresh(key, partial(scrape_country, key))
+            try:
+                result = await wait_for_load(future)
+                outcome = "fallback" if result.get("used_fallback") else "scraped"
+            except asyncio.CancelledError:
+                # Only a cancelled load is a failed refresh; our own cancellation
+                # (stop()) leaves the shielded future pending and must propagate.
+                if not (future.done() and (future.cancelled() or isinstance(future.exception(), asyncio.CancelledError))):
+                    raise
+                print(f"[ERROR] Prefetch of '{key}' failed: load was cancelled")
+                outcome = "error"
+            except Exception as e:
+                print(f"[ERROR] Prefetch of '{key}' failed: {e}")
+                outcome = "error"
+        metrics.PREFETCH_RUNS.inc(country=key, outcome=outcome)
+        metrics.log_event("prefetch", country=key, outcome=outcome)
+        return outcome
+
+    async def _loop(self, key: str, delay: float):
+        while True:
+            await asyncio.sleep(delay)
+            outcome = await self.refresh(key)
+            # A fallback payload means the live page wasn't usable: retry sooner.
+            if outcome == "scraped":
+                self.failures[key] = 0
+                delay = jittered(self.interval)
+            else:
+                self.failures[key] += 1
+                delay = jittered(backoff_delay(self.failures[key]))
+
+
+async def serve_cached(key: str, cache=requirements_cache) -> dict:
+    # Request-path lookup when prefetching is on: never scrapes. Serves the last
+    # payload whatever its age, joins a refresh already in flight, or falls back
+    # to the scraper's verified static payload until the first refresh lands.
+    value = cache.lookup(key)
+    if value is not None:
+        return value
+    future = cache.inflight(key)
+    if future is not None:
+        return await wait_for_load(future)
+    fallback = SCRAPERS[key].fallback()
+    if fallback is None:
+        return {"error": f"Requirements for {SCRAPERS[key].country} are not available yet."}
+    fallback["used_fallback"] = True
+    return fallback
+
+
+async def sync_from_store(cache=requirements_cache, interval: float = SYNC_INTERVAL):
+    while True:
+        await asyncio.sleep(jittered(interval))
+        try:
+            updated = await asyncio.to_thread(cache.sync)
+        except Exception as e:
+            print(f"[ERROR] Failed to sync requirements from the snapshot store: {e}")
+            continue
+        if updated:
+            print(f"[INFO] Picked up {updated} refreshed requirement snapshot(s)")
+
+
+async def run_worker(keys, once: bool):
+    from backend.scrape.async_scrape import close_async_client
+    from backend.scrape.driver_pool import driver_pool
+
+    requirements_cache.warm()
+    scheduler = PrefetchScheduler(keys)
+    try:
+        if once:
+            for key, outcome in (await scheduler.run_once()).items():
+                print(f"[INFO] {key}: {outcome}")
+            return
+        scheduler.start()
+        print(f"[INFO] Prefetching {', '.join(scheduler.keys)} every ~{scheduler.interval:.0f}s")
+        await asyncio.Event().wait()
+    finally:
+        await scheduler.stop()
+        await close_async_client()
+        driver_pool.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Keep scraped visa requirements fresh in the snapshot store.")
+    parser.add_argument("--countries", nargs="+", choices=sorted(SCRAPERS), help="default: every registered country")
+    parser.add_argument("--once", action="store_true", help="refresh each country once and exit")
+    args = parser.parse_args()
+    if requirements_cache.store is None:
+        print("[WARN] SNAPSHOT_DB_PATH is empty; results won't be visible to other processes")
+    try:
+        asyncio.run(run_worker(args.countries, args.once))
+    except KeyboardInterrupt:
+        pass
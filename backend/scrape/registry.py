@@ -0,0 +1,103 @@
+# scrape/registry.py
+# Country scraper registry. Each scraper declares its sources and implements
+# parse()/fallback(); fetching, fallback handling and dispatch live here so
+# cross-cutting behaviour applies to every country at once.
+import copy
+import re
+import time
+
+from backend import metrics
+from backend.knowledge.base import knowledge_base
+from backend.scrape.page_loader import fetch_sources
+from backend.scrape.timing import nested_totals, record
+
+SCRAPERS = {}
+# Normalized country name or alias -> scraper key, built at registration time.
+ALIASES = {}
+
+
+def normalize_country(name: str) -> str:
+    name = name.strip().lower().replace(".", "")
+    return re.sub(r"\s+", " ", name)
+
+
+def register(cls):
+    scraper = cls()
+    SCRAPERS[cls.key] = scraper
+    for alias in (cls.key, cls.country, *cls.aliases):
+        ALIASES[normalize_country(alias)] = cls.key
+    return cls
+
+
+def resolve(country: str):
+    # Returns the registered scraper for a country name or alias, or None.
+    key = ALIASES.get(normalize_country(country or ""))
+    return SCRAPERS.get(key) if key else None
+
+
+class CountryScraper:
+    key = ""
+    country = ""
+    aliases = ()
+    # Source tuples in priority order; the first one is the primary page.
+    sources = []
+    # (source fingerprint, parsed payload) of the last successful parse.
+    _last_parse = None
+
+    @property
+    def static(self) -> bool:
+        # True when every source is plain HTML, so no browser is ever needed.
+        return all(source.static_only for source in self.sources)
+
+    def fetch(self):
+        return fetch_sources(self.sources)
+
+    def parse(self, sources) -> dict:
+        # Returns the payload, or None when the page didn't yield enough data.
+        raise NotImplementedError
+
+    def fallback(self):
+        # Served when scraping fails: the curated knowledge base entry, or None
+        # (re-raise) for countries it doesn't cover yet.
+        return knowledge_base.payload(self.key)
+
+    def run(self, sources) -> dict:
+        # Pages identical to the last successful parse give the same payload.
+        fingerprint = sources.fingerprint()
+        last = self._last_parse
+        if fingerprint is not None and last is not None and last[0] == fingerprint:
+            self._count("unchanged")
+            return copy.deepcopy(last[1])
+
+        error = None
+        started = time.perf_counter()
+        try:
+            # Time in parse() not spent building the HTML tree is normalization.
+            with nested_totals() as nested:
+                result = self.parse(sources)
+            record("normalize", time.perf_counter() - started - nested.get("parse", 0.0))
+        except Exception as e:
+            print(f"[ERROR] Failed to scrape {self.country} requirements: {e}")
+            error, result = e, None
+
+        if result is not None:
+            result.setdefault("used_fallback", False)
+            self._count("fallback" if result["used_fallback"] else "scraped")
+            if fingerprint is not None and not result["used_fallback"]:
+                self._last_parse = (fingerprint, copy.deepcopy(result))
+            return result
+
+        result = self.fallback()
+        if result is None:
+            self._count("error")
+            raise error or RuntimeError(f"No {self.country} requirements found")
+        result["used_fallback"] = True
+        self._count("fallback")
+        return result
+
+    def _count(self, outcome: str):
+        metrics.SCRAPE_RESULTS.inc(country=self.key, outcome=outcome)
+        metrics.log_event("scrape_result", country=self.key, outcome=outcome)
+
+    def scrape(self) -> dict:
+        return self.run(self.fetch())
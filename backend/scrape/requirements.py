@@ -1,19 +1,63 @@
 # scrape/requirements.py
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-import requests
-from bs4 import BeautifulSoup
 import re
+from datetime import datetime
+
+from backend.scrape.page_loader import Source
+from backend.scrape.parsing import CANADA_DOCUMENTS, GERMANY_SECONDARY_CONTENT, UK_MAIN, make_soup
+from backend.scrape.registry import SCRAPERS, CountryScraper, register, resolve
 
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-def scrape_uk():
-    url = "https://www.gov.uk/student-visa"
-    response = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(response.text, "html.parser")
+# Official government sources
+UK_URL = "https://www.gov.uk/student-visa"
+CANADA_URL = "https://www.canada.ca/en/immigration-refugees-citizenship/services/study-canada/study-permit/apply.html"
+USA_URLS = [
+    "https://travel.state.gov/content/travel/en/us-visas/study/student-visa.html",  # Primary source
+    "https://www.usa.gov/student-visa"  # Secondary source
+]
+GERMANY_URLS = [
+    "https://www.make-it-in-germany.com/en/visa-residence/student-visa",
+    "https://www.auswaertiges-amt.de/en/visa-service/visabestimmungen-node/studium-en/606846"
+]
+
+# Elements each scraper parses; page loads return as soon as these exist.
+CANADA_READY_XPATH = "//section[@id='get-documents']//li"
+USA_READY_XPATH = "//h2[normalize-space()='Gather Required Documentation']/following::ul[1]/li"
+GERMANY_READY_XPATH = (
+    "//section[@id='documents']"
+    " | //h2[contains(translate(., 'DOCUMENTSNED', 'documentsned'), 'documents')"
+    " and contains(translate(., 'DOCUMENTSNED', 'documentsned'), 'need')]"
+)
+GERMANY_SECONDARY_READY_XPATH = "//div[@id='content']"
+
+# Patterns compiled once at import rather than per scrape.
+USA_EARLY_APPLICATION_RE = re.compile(r'365 days before', re.IGNORECASE)
+GERMANY_DOCS_HEADING_RE = re.compile(r'documents.*need', re.IGNORECASE)
+CITATION_RE = re.compile(r'\[\d+\]')
+BULLET_SPLIT_RE = re.compile(r'[•:]')
+GERMANY_DOC_KEYWORDS = [
+    (re.compile(pattern, re.IGNORECASE), standard) for pattern, standard in [
+        (r'passport|reisepass', "Valid passport (with 2+ blank pages)"),
+        (r'admission|zulassung|acceptance', "University admission letter (Zulassungsbescheid)"),
+        (r'financial|finan|blocked account', "Proof of financial resources (€11,904/year in blocked account)"),
+        (r'insurance|krankenversicherung', "Health insurance coverage confirmation"),
+        (r'application form|antragsformular', "Completed visa application forms (2 copies)"),
+        (r'photo|bild|biometric', "Biometric passport photos (35x45mm)"),
+        (r'academic|qualification|zeugnis', "Academic qualifications (certified copies)"),
+        (r'curriculum vitae|lebenslauf|cv', "Curriculum vitae (tabular format)"),
+        (r'motivation|motivational', "Motivational letter explaining study plans"),
+        (r'language|sprachkenntnisse', "Language proficiency certificate"),
+        (r'fee|gebühr', "Fee payment confirmation (€75)")
+    ]
+]
+
+
+@register
+class UKScraper(CountryScraper):
+    key = "uk"
+    country = "UK"
+    aliases = ("united kingdom", "great britain", "britain", "england", "scotland", "wales")
+    sources = [Source(UK_URL, static_only=True)]
 
     KEYWORDS = [
         "passport", "confirmation", "financial", "english", "tuberculosis",
@@ -22,10 +66,20 @@ def scrape_uk():
         "fee", "switch", "extend", "graduate", "stay"
     ]
 
+    def parse(self, sources):
+        html = sources.html(0)
+        if html is None:
+            raise RuntimeError("UK student visa page could not be fetched")
+        return parse_uk(html)
+
+
+def parse_uk(html: str):
+    soup = make_soup(html, UK_MAIN)
+
     docs = []
     for li in soup.select("main ul li"):
         text = li.get_text(strip=True)
-        if any(word in text.lower() for word in KEYWORDS):
+        if any(word in text.lower() for word in UKScraper.KEYWORDS):
             docs.append(text)
 
     return {
@@ -34,39 +88,23 @@ def scrape_uk():
         "documents": docs[:12],
         "language_requirements": "IELTS or equivalent required by institutions.",
         "timeline": "Apply up to 6 months before your course starts.",
-        "official_links": [url]
+        "official_links": [UK_URL]
     }
 
-def scrape_canada():
-    from datetime import datetime
-
-    url = "https://www.canada.ca/en/immigration-refugees-citizenship/services/study-canada/study-permit/apply.html"
-
-    fallback_documents = [
-        "Letter of acceptance from a designated learning institution (DLI)",
-        "Provincial Attestation Letter (PAL) from the province/territory",
-        "Proof of financial support (minimum $20,635 for 2025)",
-        "Valid passport/travel document",
-        "Medical exam results (if required)",
-        "Police certificate (if required)"
-    ]
 
-    documents = []
-    used_fallback = False
+@register
+class CanadaScraper(CountryScraper):
+    key = "canada"
+    country = "Canada"
+    sources = [Source(CANADA_URL, ready_xpath=CANADA_READY_XPATH)]
 
-    try:
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        driver.get(url)
-        time.sleep(8)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        driver.quit()
+    def parse(self, sources):
+        html = sources.html(0)
+        if html is None:
+            raise RuntimeError("Canada study permit page could not be fetched")
+        soup = make_soup(html, CANADA_DOCUMENTS)
 
+        documents = []
         section = soup.find('section', id='get-documents')
         if section:
             list_items = section.find_all('li')
@@ -82,52 +120,41 @@ def scrape_canada():
                     documents.append(text)
 
         if len(documents) < 3:
-            documents = fallback_documents
-            used_fallback = True
+            return None
+        return self.payload(documents)
+
+    def payload(self, documents: list) -> dict:
+        return {
+            "country": "Canada",
+            "visa_type": "Study Permit",
+            "documents": documents[:6],
+            "language_requirements": "IELTS/TOEFL/CELPIP required by institution",
+            "timeline": "Apply 3-6 months before program start",
+            "official_links": [
+                CANADA_URL,
+                "https://www.canada.ca/en/immigration-refugees-citizenship/services/application/application-forms-guides/guide-5269-applying-study-permit-outside-canada.html"
+            ],
+            "last_updated": datetime.utcnow().isoformat() + "Z"
+        }
 
-    except Exception as e:
-        documents = fallback_documents
-        used_fallback = True
-        print(f"[ERROR] Failed to scrape Canada study permit page: {e}")
 
-    return {
-        "country": "Canada",
-        "visa_type": "Study Permit",
-        "documents": documents[:6],
-        "language_requirements": "IELTS/TOEFL/CELPIP required by institution",
-        "timeline": "Apply 3-6 months before program start",
-        "official_links": [
-            url,
-            "https://www.canada.ca/en/immigration-refugees-citizenship/services/application/application-forms-guides/guide-5269-applying-study-permit-outside-canada.html"
-        ],
-        "used_fallback": used_fallback,
-        "last_updated": datetime.utcnow().isoformat() + "Z"
-    }
-def scrape_usa():
-    # Official government sources
-    urls = [
-        "https://travel.state.gov/content/travel/en/us-visas/study/student-visa.html",  # Primary source
-        "https://www.usa.gov/student-visa"  # Secondary source
+@register
+class USAScraper(CountryScraper):
+    key = "usa"
+    country = "USA"
+    aliases = ("united states", "united states of america", "us", "america")
+    sources = [
+        Source(USA_URLS[0], ready_xpath=USA_READY_XPATH),
+        Source(USA_URLS[1], static_only=True),
     ]
-    
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-
-    try:
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
-        driver.get(urls[0])
-        time.sleep(8)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        driver.quit()
 
-        documents = []
+    def parse(self, sources):
+        urls = USA_URLS
+        html = sources.html(0)
+        if html is None and sources.html(1) is None:
+            raise RuntimeError("No USA source could be fetched")
+        soup = make_soup(html or "")
+
         core_requirements = []
 
         # Extract from primary source
@@ -152,7 +179,7 @@ def scrape_usa():
         # Extract fees and processing time
         timeline = "Apply 3-6 months before program start"
         fees = "$535 total ($350 SEVIS + $185 application)"
-        if soup.find(string=re.compile(r'365 days before', re.IGNORECASE)):
+        if soup.find(string=USA_EARLY_APPLICATION_RE):
             timeline = "Apply up to 12 months before program start (entry permitted 30 days before)"
 
         # Extract visa types
@@ -165,10 +192,8 @@ def scrape_usa():
                     visa_types.append(f"{cells[0].get_text(strip=True)}: {cells[1].get_text(strip=True)}")
 
         # Fallback to secondary source if needed
-        if not core_requirements:
-            import requests
-            response = requests.get(urls[1], timeout=10)
-            soup_secondary = BeautifulSoup(response.text, 'html.parser')
+        if not core_requirements and sources.html(1):
+            soup_secondary = make_soup(sources.html(1))
             requirements_section = soup_secondary.find('h2', string='Student visa requirements')
             if requirements_section:
                 next_ul = requirements_section.find_next('ul')
@@ -184,7 +209,7 @@ def scrape_usa():
             "financial": "Proof of financial support for tuition/living expenses",
             "academic": "Academic transcripts and diplomas"
         }
-        
+
         for doc in essential_docs.values():
             if not any(keyword in d.lower() for d in core_requirements for keyword in doc.split()[:2]):
                 core_requirements.append(doc)
@@ -192,7 +217,7 @@ def scrape_usa():
         return {
             "country": "USA",
             "visa_types": visa_types or ["F-1 (Academic Studies)", "M-1 (Vocational Studies)", "J-1 (Exchange Programs)"],
-            "documents": list(set(core_requirements))[:12],
+            "documents": list(dict.fromkeys(core_requirements))[:12],
             "fees": fees,
             "language_requirements": "TOEFL/IELTS/Duolingo required by institution",
             "timeline": timeline,
@@ -204,99 +229,61 @@ def scrape_usa():
             "official_links": urls
         }
 
-    except Exception as e:
-        # Verified fallback based on 2025 requirements
-        return {
-            "country": "USA",
-            "visa_types": ["F-1 (Academic)", "M-1 (Vocational)", "J-1 (Exchange)"],
-            "documents": [
-                "Valid passport (6+ months validity)",
-                "Form I-20 from SEVP-approved school",
-                "DS-160 confirmation page",
-                "SEVIS I-901 fee receipt ($350)",
-                "Visa application fee payment ($185)",
-                "Proof of financial support (tuition + living expenses)",
-                "Academic transcripts and diplomas",
-                "Standardized test scores (if required by institution)",
-                "Passport-style photograph",
-                "Evidence of intent to return home after studies"
-            ],
-            "fees": "$535 total ($350 SEVIS + $185 application)",
-            "language_requirements": "TOEFL/IELTS/Duolingo required by institution",
-            "timeline": "Apply 3-6 months before program start",
-            "special_notes": [
-                "Initial entry permitted 30 days before program start",
-                "On-campus work limited to 20 hrs/week during semester",
-                "OPT work authorization requires separate application"
-            ],
-            "official_links": urls
-        }
-
 
-def scrape_germany():
-      # Official government sources
-    urls = [
-        "https://www.make-it-in-germany.com/en/visa-residence/student-visa",
-        "https://www.auswaertiges-amt.de/en/visa-service/visabestimmungen-node/studium-en/606846"
+@register
+class GermanyScraper(CountryScraper):
+    key = "germany"
+    country = "Germany"
+    aliases = ("deutschland",)
+    sources = [
+        Source(GERMANY_URLS[0], ready_xpath=GERMANY_READY_XPATH),
+        Source(GERMANY_URLS[1], ready_xpath=GERMANY_SECONDARY_READY_XPATH),
     ]
 
-    # Configure browser
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-
-    try:
-        # Initialize WebDriver
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
-        driver.get(urls[0])
-        time.sleep(8)  # Allow full page rendering
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
+    def parse(self, sources):
+        urls = GERMANY_URLS
+        html = sources.html(0)
+        if html is None and sources.html(1) is None:
+            raise RuntimeError("No Germany source could be fetched")
+        soup = make_soup(html or "")
+
         # Extract document section
         documents = []
         section = None
-        
+
         # Method 1: Find by heading text
-        heading = soup.find('h2', string=re.compile(r'documents.*need', re.IGNORECASE))
+        heading = soup.find('h2', string=GERMANY_DOCS_HEADING_RE)
         if heading:
             section = heading.find_parent('section')
             if not section:
                 section = heading.find_next('div', class_='rich-text')
-        
+
         # Method 2: Find by section ID
         if not section:
             section = soup.find('section', id='documents')
-        
+
         # Extract documents from section
         if section:
             # Handle list formats
             for ul in section.find_all('ul'):
                 for li in ul.find_all('li'):
                     text = li.get_text(separator=' ', strip=True)
-                    text = re.sub(r'\[\d+\]', '', text)  # Remove citations
+                    text = CITATION_RE.sub('', text)  # Remove citations
                     if len(text) > 10:
                         documents.append(text)
-            
+
             # Handle paragraph formats
             if not documents:
                 for p in section.find_all('p'):
                     text = p.get_text(strip=True)
                     if '•' in text or ':' in text:
-                        parts = re.split(r'[•:]', text)
+                        parts = BULLET_SPLIT_RE.split(text)
                         documents.extend([part.strip() for part in parts if len(part.strip()) > 20])
 
         # If still no documents, try secondary source
-        if not documents:
-            driver.get(urls[1])
-            time.sleep(5)
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
+        if not documents and sources.html(1):
+            soup = make_soup(sources.html(1), GERMANY_SECONDARY_CONTENT)
+
             # Find document section in Foreign Office site
             section = soup.find('div', id='content')
             if section:
@@ -306,7 +293,7 @@ def scrape_germany():
                     if len(cells) >= 2:
                         doc_text = f"{cells[0].get_text(strip=True)}: {cells[1].get_text(strip=True)}"
                         documents.append(doc_text)
-                
+
                 # Extract list items
                 if not documents:
                     for li in section.find_all('li'):
@@ -314,34 +301,19 @@ def scrape_germany():
                         if len(text) > 30:
                             documents.append(text)
 
-        driver.quit()
-
         # Process and standardize documents
         processed_docs = []
-        doc_keywords = {
-            r'passport|reisepass': "Valid passport (with 2+ blank pages)",
-            r'admission|zulassung|acceptance': "University admission letter (Zulassungsbescheid)",
-            r'financial|finan|blocked account': "Proof of financial resources (€11,904/year in blocked account)",
-            r'insurance|krankenversicherung': "Health insurance coverage confirmation",
-            r'application form|antragsformular': "Completed visa application forms (2 copies)",
-            r'photo|bild|biometric': "Biometric passport photos (35x45mm)",
-            r'academic|qualification|zeugnis': "Academic qualifications (certified copies)",
-            r'curriculum vitae|lebenslauf|cv': "Curriculum vitae (tabular format)",
-            r'motivation|motivational': "Motivational letter explaining study plans",
-            r'language|sprachkenntnisse': "Language proficiency certificate",
-            r'fee|gebühr': "Fee payment confirmation (€75)"
-        }
-        
+
         # Map to standardized documents
         for doc in documents:
-            for pattern, standard in doc_keywords.items():
-                if re.search(pattern, doc, re.IGNORECASE):
+            for pattern, standard in GERMANY_DOC_KEYWORDS:
+                if pattern.search(doc):
                     if standard not in processed_docs:
                         processed_docs.append(standard)
                     break
-        
+
         # Add missing essential documents
-        essentials = list(doc_keywords.values())
+        essentials = [standard for _, standard in GERMANY_DOC_KEYWORDS]
         for item in essentials:
             if item not in processed_docs:
                 processed_docs.append(item)
@@ -355,35 +327,22 @@ def scrape_germany():
             "official_links": urls
         }
 
-    except Exception as e:
-        # Minimal fallback if all else fails
-        print("returning to fallback")
-        return {
-            "country": "Germany",
-            "visa_type": "Student Visa",
-            "documents": [
-                "Valid passport (with 2+ blank pages)",
-                "University admission letter (Zulassungsbescheid)",
-                "Proof of financial resources (€11,904/year in blocked account)",
-                "Health insurance coverage confirmation",
-                "Completed visa application forms (2 copies)",
-                "Biometric passport photos (35x45mm)"
-            ],
-            "language_requirements": "German: TestDaF/Goethe (B2-C1) or English: IELTS/TOEFL (university-specific)",
-            "timeline": "Apply 3-6 months before studies begin",
-            "official_links": urls
-        }
+
+def scrape_uk():
+    return SCRAPERS["uk"].scrape()
+
+def scrape_canada():
+    return SCRAPERS["canada"].scrape()
+
+def scrape_usa():
+    return SCRAPERS["usa"].scrape()
+
+def scrape_germany():
+    return SCRAPERS["germany"].scrape()
 
 # Dispatcher
 def get_study_visa_requirements(country: str):
-    country = country.lower()
-    if "canada" in country:
-        return scrape_canada()
-    elif "uk" in country or "united kingdom" in country:
-        return scrape_uk()
-    elif "usa" in country or "united states" in country or "america" in country:
-        return scrape_usa()
-    elif "germany" in country:
-        return scrape_germany()
-    else:
-        return {"error": "Country not yet supported. Coming soon!"}
\ No newline at end of file
+    scraper = resolve(country)
+    if scraper is None:
+        return {"error": "Country not yet supported. Coming soon!"}
+    return scraper.scrape()
@@ -0,0 +1,314 @@
+# scrape/research.py
+# Job-based access to the deep-research requirements lookup (minutes of latency
+# and real cost per call). Identical (country, nationality) requests share one
+# job, results are persisted with an expiry, and the expensive call runs at most
+# once per key per refresh window. RESEARCH_BACKEND=mock swaps in a local,
+# offline backend for development and tests.
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from backend import metrics
+from backend.knowledge.base import knowledge_base
+from backend.scrape.registry import normalize_country, resolve
+from backend.scrape.snapshots import DEFAULT_DB_PATH
+
+BACKEND = os.getenv("RESEARCH_BACKEND", "openai")
+MODEL = os.getenv("RESEARCH_MODEL", "o3-deep-research")
+# Results are reused for this long before the next submit runs the model again.
+RESULT_TTL = int(os.getenv("RESEARCH_RESULT_TTL", str(30 * 24 * 60 * 60)))
+CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "1"))
+REQUEST_TIMEOUT = float(os.getenv("RESEARCH_TIMEOUT", "1800"))
+# Finished jobs stay pollable for this long; their results outlive them in the store.
+JOB_RETENTION = int(os.getenv("RESEARCH_JOB_RETENTION", "3600"))
+MOCK_LATENCY = float(os.getenv("RESEARCH_MOCK_LATENCY", "2"))
+# Empty keeps results in memory only.
+DB_PATH = os.getenv("RESEARCH_DB_PATH", DEFAULT_DB_PATH)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_results (
+    country TEXT NOT NULL,
+    nationality TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (country, nationality)
+);
+"""
+
+
+def research_key(country: str, nationality: str) -> tuple:
+    # Supported countries collapse onto their scraper key so aliases coalesce.
+    scraper = resolve(country)
+    return scraper.key if scraper else normalize_country(country), normalize_country(nationality)
+
+
+def build_research_prompt(country: str, nationality: str) -> str:
+    return f"""
+    Provide official study visa requirements for {nationality} applicants to {country}.
+    Return:
+    - Academic and document requirements
+    - Financial proof and language tests (IELTS/TOEFL)
+    - Application deadlines and official portal
+    - Include bullet points and cite source links and dates.
+    """
+
+
+class OpenAIResearchBackend:
+    def __init__(self, model: str = MODEL):
+        self.model = model
+        self._client = None
+
+    async def run(self, country: str, nationality: str) -> str:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL") or None,
+                                       timeout=REQUEST_TIMEOUT)
+        response = await self._client.responses.create(
+            model=self.model,
+            input=build_research_prompt(country, nationality),
+            tools=[{"type": "web_search_preview"}]
+        )
+        return response.output_text
+
+
+class MockResearchBackend:
+    # Answers from the curated knowledge base after a simulated delay.
+    model = "mock"
+
+    def __init__(self, latency: float = MOCK_LATENCY):
+        self.latency = latency
+        self.calls = 0
+
+    async def run(self, country: str, nationality: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        scraper = resolve(country)
+        payload = knowledge_base.payload(scraper.key) if scraper else None
+        if payload is None:
+            return f"No research available for {nationality} applicants to {country} (mock backend)."
+        lines = [f"Study visa requirements for {nationality} applicants to {payload['country']} (mock backend):"]
+        lines += [f"- {document}" for document in payload["documents"]]
+        lines.append(f"- Language: {payload['language_requirements']}")
+        lines.append(f"- Timeline: {payload['timeline']}")
+        lines += [f"- Source: {link}" for link in payload["official_links"]]
+        return "\n".join(lines)
+
+
+def make_result(country: str, nationality: str, text: str, model: str, ttl: int = RESULT_TTL) -> dict:
+    now = time.time()
+    return {
+        "country": country,
+        "nationality": nationality,
+        "visa_type": "Study Permit",
+        "requirements": text,
+        "model": model,
+        "generated_at": now,
+        "expires_at": now + ttl,
+    }
+
+
+def default_backend():
+    return MockResearchBackend() if BACKEND == "mock" else OpenAIResearchBackend()
+
+
+class ResearchStore:
+    # (country, nationality) -> latest result with an expiry; SQLite when a path
+    # is configured, otherwise a dict in this process.
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._memory = {}
+        self._lock = threading.Lock()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: tuple, now: float = None):
+        now = now if now is not None else time.time()
+        if not self.path:
+            with self._lock:
+                entry = self._memory.get(key)
+            return entry[1] if entry and entry[0] > now else None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM research_results WHERE country = ? AND nationality = ? AND expires_at > ?",
+                (*key, now),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: tuple, payload: dict, ttl: int = RESULT_TTL, now: float = None):
+        now = now if now is not None else time.time()
+        if not self.path:
+            with self._lock:
+                self._memory[key] = (now + ttl, payload)
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO research_results (country, nationality, created_at, expires_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*key, now, now + ttl, json.dumps(payload, ensure_ascii=False)),
+            )
+
+
+class Job:
+    def __init__(self, key: tuple, country: str, nationality: str):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.country = country
+        self.nationality = nationality
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        # Answered from a stored result rather than a model call.
+        self.stored = False
+
+    def finish(self, status: str, result: dict = None, error: str = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+
+    def view(self) -> dict:
+        view = {
+            "job_id": self.id,
+            "status": self.status,
+            "country": self.country,
+            "nationality": self.nationality,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "stored": self.stored,
+        }
+        if self.error:
+            view["error"] = self.error
+        return view
+
+
+class ResearchJobs:
+    def __init__(self, backend=None, store=None, ttl: int = RESULT_TTL, concurrency: int = CONCURRENCY,
+                 retention: int = JOB_RETENTION):
+        self.backend = backend or default_backend()
+        self.store = store if store is not None else open_default_store()
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.retention = retention
+        self._jobs = {}
+        self._inflight = {}
+        self._tasks = set()
+        self._slots = None
+
+    async def submit(self, country: str, nationality: str):
+        # Returns (job, coalesced): coalesced means the job was already running
+        # for the same key. An unexpired stored result comes back as a finished
+        # job with job.stored set; only otherwise is the model called.
+        self._prune()
+        key = research_key(country, nationality)
+        stored = None
+        job_id = self._inflight.get(key)
+        if job_id is None:
+            stored = await asyncio.to_thread(self.store.get, key)
+            # Re-checked after the read: another submit may have started the job.
+            job_id = self._inflight.get(key)
+        if job_id is not None:
+            metrics.RESEARCH_JOBS.inc(outcome="coalesced")
+            return self._jobs[job_id], True
+
+        job = Job(key, country, nationality)
+        self._jobs[job.id] = job
+        if stored is not None:
+            metrics.RESEARCH_JOBS.inc(outcome="stored")
+            job.stored = True
+            job.finish("done", result=stored)
+            return job, False
+
+        metrics.RESEARCH_JOBS.inc(outcome="submitted")
+        self._inflight[key] = job.id
+        task = asyncio.get_running_loop().create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, False
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, job: Job):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        try:
+            async with self._slots:
+                job.status = "running"
+                started = time.perf_counter()
+                text = await self.backend.run(job.country, job.nationality)
+            result = make_result(job.country, job.nationality, text, self.backend.model, self.ttl)
+            try:
+                await asyncio.to_thread(self.store.put, job.key, result, self.ttl)
+            except Exception as e:
+                print(f"[ERROR] Failed to persist research result for {job.key}: {e}")
+            job.finish("done", result=result)
+            metrics.RESEARCH_JOBS.inc(outcome="done")
+            metrics.log_event("research_job", job_id=job.id, outcome="done",
+                              seconds=round(time.perf_counter() - started, 2))
+        except asyncio.CancelledError:
+            job.finish("failed", error="Cancelled during shutdown")
+            raise
+        except Exception as e:
+            print(f"[ERROR] Research job {job.id} for {job.key} failed: {e}")
+            job.finish("failed", error=str(e) or type(e).__name__)
+            metrics.RESEARCH_JOBS.inc(outcome="failed")
+        finally:
+            self._inflight.pop(job.key, None)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+def open_default_store() -> ResearchStore:
+    try:
+        return ResearchStore(DB_PATH)
+    except (sqlite3.Error, OSError) as e:
+        print(f"[ERROR] Research store unavailable at {DB_PATH}, keeping results in memory: {e}")
+        return ResearchStore("")
+
+
+research_jobs = ResearchJobs()
+
+
+def research_requirements(country: str, nationality: str = "Nigeria") -> dict:
+    # Blocking, memoized lookup for scripts outside the event loop; the API uses
+    # research_jobs so callers can poll instead of holding a request open.
+    key = research_key(country, nationality)
+    stored = research_jobs.store.get(key)
+    if stored is not None:
+        return stored
+    # A fresh backend: its async client must not outlive this event loop.
+    backend = default_backend()
+    text = asyncio.run(backend.run(country, nationality))
+    result = make_result(country, nationality, text, backend.model, research_jobs.ttl)
+    research_jobs.store.put(key, result, research_jobs.ttl)
+    return result
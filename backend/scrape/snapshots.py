@@ -0,0 +1,154 @@
+# scrape/snapshots.py
+# Versioned on-disk store of scraper outputs. A new version is written only when
+# the payload changes; unchanged scrapes just bump checked_at on the latest one.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = os.getenv("SNAPSHOT_DB_PATH", os.path.join("data", "snapshots.db"))
+
+# Fields that change on every scrape and must not count as a content change.
+VOLATILE_FIELDS = ("last_updated",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    country TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_country ON snapshots (country, id);
+"""
+
+
+def content_hash(payload: dict) -> str:
+    stable = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+    raw = json.dumps(stable, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, country: str, payload: dict, now: float = None) -> int:
+        now = now if now is not None else time.time()
+        digest = content_hash(payload)
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, content_hash FROM snapshots WHERE country = ? ORDER BY id DESC LIMIT 1",
+                (country,),
+            ).fetchone()
+            if row and row[1] == digest:
+                conn.execute(
+                    "UPDATE snapshots SET checked_at = ?, payload = ? WHERE id = ?",
+                    (now, json.dumps(payload, ensure_ascii=False), row[0]),
+                )
+                return row[0]
+            cursor = conn.execute(
+                "INSERT INTO snapshots (country, content_hash, fetched_at, checked_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (country, digest, now, now, json.dumps(payload, ensure_ascii=False)),
+            )
+            return cursor.lastrowid
+
+    def latest(self, country: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, checked_at FROM snapshots WHERE country = ? ORDER BY id DESC LIMIT 1",
+                (country,),
+            ).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def latest_all(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT country, payload, checked_at FROM snapshots "
+                "WHERE id IN (SELECT MAX(id) FROM snapshots GROUP BY country)"
+            ).fetchall()
+        return {country: (json.loads(payload), checked_at) for country, payload, checked_at in rows}
+
+    def history(self, country: str, limit: int = 20) -> list:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, content_hash, fetched_at, checked_at FROM snapshots "
+                "WHERE country = ? ORDER BY id DESC LIMIT ?",
+                (country, limit),
+            ).fetchall()
+        return [
+            {"id": row[0], "content_hash": row[1], "fetched_at": row[2], "checked_at": row[3]}
+            for row in rows
+        ]
+
+    def get(self, country: str, snapshot_id: int):
+        # None unless the snapshot exists and belongs to country.
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM snapshots WHERE id = ? AND country = ?", (snapshot_id, country)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def diff(self, country: str, from_id: int = None, to_id: int = None):
+        # Compares two of country's snapshots, or its latest two when no ids are
+        # given; None if either is missing or belongs to another country.
+        if (from_id is None) != (to_id is None):
+            raise ValueError("Pass both from_id and to_id, or neither.")
+        if from_id is None:
+            versions = self.history(country, limit=2)
+            if len(versions) < 2:
+                return None
+            to_id, from_id = versions[0]["id"], versions[1]["id"]
+        old, new = self.get(country, from_id), self.get(country, to_id)
+        if old is None or new is None:
+            return None
+        return {"country": country, "from_id": from_id, "to_id": to_id, "changes": diff_payloads(old, new)}
+
+
+def diff_payloads(old: dict, new: dict) -> dict:
+    changes = {}
+    for key in sorted(set(old) | set(new)):
+        if key in VOLATILE_FIELDS:
+            continue
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if isinstance(before, list) and isinstance(after, list):
+            changes[key] = {
+                "added": [item for item in after if item not in before],
+                "removed": [item for item in before if item not in after],
+            }
+        else:
+            changes[key] = {"before": before, "after": after}
+    return changes
+
+
+def open_default_store():
+    if not DEFAULT_DB_PATH:
+        return None
+    try:
+        return SnapshotStore(DEFAULT_DB_PATH)
+    except (sqlite3.Error, OSError) as e:
+        print(f"[ERROR] Snapshot store unavailable at {DEFAULT_DB_PATH}: {e}")
+        return None
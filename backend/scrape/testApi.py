@@ -1,4 +1,4 @@
-from requirements import scrape_usa
+from backend.scrape.requirements import scrape_usa
 import json
 
 if __name__ == "__main__":
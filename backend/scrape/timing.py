@@ -0,0 +1,63 @@
+# scrape/timing.py
+# Process-wide stage timings for the scraping pipeline (browser start, page
+# load, parse, normalize). Kept in bounded per-stage buffers so the benchmark
+# suite and /metrics can read them without any external dependency.
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from backend import metrics
+
+MAX_SAMPLES = 1000
+
+_samples = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def record(name: str, seconds: float):
+    with _lock:
+        buffer = _samples.get(name)
+        if buffer is None:
+            buffer = _samples[name] = deque(maxlen=MAX_SAMPLES)
+        buffer.append(seconds)
+    metrics.SCRAPE_STAGE_SECONDS.observe(seconds, stage=name)
+    metrics.log_event("scrape_stage", stage=name, seconds=round(seconds, 4))
+    # Per-thread running totals let a caller subtract nested stages.
+    totals = getattr(_local, "totals", None)
+    if totals is not None:
+        totals[name] = totals.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+@contextmanager
+def nested_totals():
+    # Collects the time spent in stages recorded on this thread while active.
+    previous = getattr(_local, "totals", None)
+    _local.totals = {}
+    try:
+        yield _local.totals
+    finally:
+        if previous is not None:
+            for name, seconds in _local.totals.items():
+                previous[name] = previous.get(name, 0.0) + seconds
+        _local.totals = previous
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {name: list(buffer) for name, buffer in _samples.items()}
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,176 @@
+# End-to-end benchmark for the API, fully offline: official pages come from the
+# fixture server, completions from the mock OpenAI server, and the app runs in
+# a local uvicorn. Reports latency percentiles and throughput per scenario and
+# the scraper stage timings (browser start, page load, parse, normalize).
+#
+#   python -m benchmarks.bench_api --requests 200 --concurrency 20
+#   python -m benchmarks.bench_api --browser        # force Selenium page loads
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+SCENARIOS = ("requirements-cold", "requirements-refresh", "requirements-warm", "roadmap")
+# Scenarios whose scraper stage timings are reported.
+SCRAPE_SCENARIOS = ("requirements-cold", "requirements-refresh")
+COUNTRIES = ("uk", "canada", "usa", "germany")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_load(make_request, total: int, concurrency: int) -> tuple:
+    import httpx
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await make_request(client, index)
+                if response.status_code != 200 or "error" in response.json():
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def print_row(name: str, latencies: list, errors: int, elapsed: float):
+    from benchmarks.common import summarize
+
+    stats = summarize(latencies)
+    print(f"{name:<20} {stats['n']:>6} {errors:>6} {stats['n'] / elapsed:>9.1f} "
+          f"{stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f} {stats['max']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end API benchmark.")
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--page-latency", type=float, default=0.0, help="simulated latency of official sites (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="simulated time to first token (s)")
+    parser.add_argument("--browser", action="store_true", help="load pages through Chrome instead of static GETs")
+    args = parser.parse_args()
+
+    from benchmarks.fixture_server import start as start_fixtures
+
+    fixture_server, fixture_base = start_fixtures(latency=args.page_latency)
+
+    # Configure the app before it is imported: every module reads its env at import.
+    os.environ["MOCK_OPENAI_LATENCY"] = str(args.llm_latency)
+    os.environ["SCRAPE_URL_BASE"] = fixture_base
+    os.environ["SCRAPE_STATIC_FIRST"] = "0" if args.browser else "1"
+    os.environ["SNAPSHOT_DB_PATH"] = ""
+    # Measure the scrape path itself rather than the background prefetcher.
+    os.environ["PREFETCH_MODE"] = "off"
+    # Every benchmark request comes from one address; export ADMISSION_ENABLED=1
+    # to measure behaviour under the per-client limits instead.
+    os.environ.setdefault("ADMISSION_ENABLED", "0")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    mock_port, app_port = free_port(), free_port()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{mock_port}/v1"
+
+    from backend.dev.mock_openai import app as mock_app
+    from backend.main import app
+    from backend.roadmap_cache import roadmap_cache
+    from backend.scrape import timing
+    from backend.scrape.cache import requirements_cache
+    from backend.scrape.conditional import page_validators
+    from backend.scrape.registry import SCRAPERS
+
+    servers = [start_uvicorn(mock_app, mock_port), start_uvicorn(app, app_port)]
+    base_url = f"http://127.0.0.1:{app_port}"
+
+    async def requirements_request(client, index):
+        country = COUNTRIES[index % len(COUNTRIES)]
+        return await client.post(f"{base_url}/api/requirements", json={"country": country})
+
+    async def cold_requirements_request(client, index):
+        # A full scrape: no cached payload, no validators for a conditional GET
+        # and no parse to reuse on an unchanged page.
+        requirements_cache.invalidate()
+        page_validators.clear()
+        for scraper in SCRAPERS.values():
+            scraper._last_parse = None
+        return await requirements_request(client, index)
+
+    async def refresh_requirements_request(client, index):
+        # What a periodic refresh of unchanged pages costs: conditional GETs
+        # answered with 304 and the previous parse reused.
+        requirements_cache.invalidate()
+        return await requirements_request(client, index)
+
+    async def roadmap_request(client, index):
+        # A distinct degree per request keeps the roadmap cache from answering.
+        profile = {
+            "fullName": "Benchmark User",
+            "degree": f"BSc Computer Science {index}",
+            "workExperience": "2 years",
+            "targetCountry": COUNTRIES[index % len(COUNTRIES)],
+            "goal": "MSc in Data Science",
+        }
+        return await client.post(f"{base_url}/generate-roadmap", json=profile)
+
+    requests_for = {
+        "requirements-cold": cold_requirements_request,
+        "requirements-refresh": refresh_requirements_request,
+        "requirements-warm": requirements_request,
+        "roadmap": roadmap_request,
+    }
+
+    print(f"{'scenario':<20} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    stage_timings = {}
+    try:
+        for scenario in args.scenarios:
+            if scenario in ("requirements-warm", "requirements-refresh"):
+                asyncio.run(run_load(requirements_request, len(COUNTRIES), 1))
+            timing.reset()
+            latencies, errors, elapsed = asyncio.run(run_load(requests_for[scenario], args.requests, args.concurrency))
+            print_row(scenario, latencies, errors, elapsed)
+            if scenario in SCRAPE_SCENARIOS:
+                stage_timings[scenario] = timing.snapshot()
+        print(f"roadmap cache: {roadmap_cache.stats()}")
+
+        from benchmarks.common import summarize
+
+        for scenario, timings in stage_timings.items():
+            print(f"\n{scenario:<20} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+            for name, samples in sorted(timings.items()):
+                stats = summarize([s * 1000 for s in samples])
+                print(f"{name:<20} {stats['n']:>6} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['max']:>9.2f}")
+    finally:
+        for server in servers:
+            server.should_exit = True
+        fixture_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Parse-time and peak-memory comparison for each country scraper on the saved
+# fixture pages: the original html.parser full-tree parse vs. lxml with
+# SoupStrainer subtree restriction.
+#
+#   python -m benchmarks.bench_parse [--repeat 50]
+import argparse
+import time
+import tracemalloc
+
+from backend.scrape import parsing
+from backend.scrape.page_loader import SourceSet
+from backend.scrape.registry import SCRAPERS
+from backend.scrape.requirements import HEADERS  # noqa: F401  (registers the scrapers)
+from benchmarks.common import load_fixture, summarize
+
+MODES = {
+    "html.parser (full tree)": ("html.parser", False),
+    "lxml (full tree)": ("lxml", False),
+    "lxml + strainers": ("lxml", True),
+}
+
+
+def run_parse(scraper, htmls: list):
+    return scraper.parse(SourceSet.prefetched(scraper.sources, htmls))
+
+
+def measure(scraper, htmls: list, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run_parse(scraper, htmls)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    run_parse(scraper, htmls)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, summarize(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'country':<9} {'mode':<26} {'p50 ms':>8} {'p95 ms':>8} {'peak KiB':>9}")
+    for key, scraper in SCRAPERS.items():
+        htmls = [load_fixture(source.url) for source in scraper.sources]
+        baseline = None
+        for mode, (html_parser, strainers) in MODES.items():
+            parsing.HTML_PARSER, parsing.USE_STRAINERS = html_parser, strainers
+            result, stats, peak = measure(scraper, htmls, args.repeat)
+            if baseline is None:
+                baseline = result
+            elif result.get("documents") != baseline.get("documents"):
+                print(f"  ! {key}: {mode} extracted different documents than html.parser")
+            print(f"{key:<9} {mode:<26} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {peak:>9.0f}")
+
+    parsing.HTML_PARSER, parsing.USE_STRAINERS = parsing.DEFAULT_PARSER, True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Shared helpers for the offline benchmarks: fixture lookup and timing stats.
+import os
+import statistics
+from urllib.parse import urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_path(url: str) -> str:
+    # https://host/a/b -> fixtures/host/a/b.html (paths already ending in .html keep it)
+    parsed = urlparse(url)
+    path = parsed.path.strip("/") or "index"
+    if not path.endswith(".html"):
+        path += ".html"
+    return os.path.join(FIXTURE_DIR, parsed.netloc, path)
+
+
+def load_fixture(url: str) -> str:
+    with open(fixture_path(url), encoding="utf-8") as f:
+        return f.read()
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "n": len(samples),
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
@@ -0,0 +1,68 @@
+# Local stand-in for the official visa pages. Serves benchmarks/fixtures so that
+# with SCRAPE_URL_BASE=http://127.0.0.1:<port> the scrapers read
+# https://www.gov.uk/student-visa from /www.gov.uk/student-visa.
+#
+#   python -m benchmarks.fixture_server [--port 8765] [--latency 0.2]
+import argparse
+import email.utils
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import fixture_path
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        path = fixture_path("https://" + self.path.split("?", 1)[0].lstrip("/"))
+        if self.latency:
+            time.sleep(self.latency)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        # Validators like the real sites send, so conditional GETs get exercised.
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        last_modified = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(port: int = 0, latency: float = 0.0):
+    # Starts the server on a background thread; returns (server, base_url).
+    handler = type("Handler", (FixtureHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded official pages locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    server, base_url = start(args.port, args.latency)
+    print(f"[INFO] Serving fixtures at {base_url} (SCRAPE_URL_BASE={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
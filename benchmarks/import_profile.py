@@ -0,0 +1,66 @@
+# Import-time profile of the API process: runs `python -X importtime` on a
+# module in a fresh interpreter and reports the slowest top-level packages, the
+# total, peak resident memory, and which heavy scraper/LLM packages got loaded
+# (they should all be deferred until first use).
+#
+#   python -m benchmarks.import_profile [--module backend.main] [--top 15]
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY = ("selenium", "webdriver_manager", "bs4", "lxml", "openai", "requests", "httpx")
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "loaded": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+
+def profile(module: str) -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, check=True,
+    )
+    # stderr lines: "import time: self [us] | cumulative | imported package"
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        if not cumulative.isdigit():
+            continue
+        top = name.split(".")[0]
+        # The outermost import of a package carries its full cumulative cost.
+        if name == top:
+            packages[top] = max(packages.get(top, 0), int(cumulative))
+    return packages, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import cost of the API process.")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    packages, summary = profile(args.module)
+    print(f"import {args.module}: {summary['seconds'] * 1000:.0f} ms, "
+          f"peak RSS {summary['max_rss_kb'] / 1024:.1f} MB")
+    print(f"\n{'package':<30} {'cumulative ms':>14}")
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<30} {micros / 1000:>14.1f}")
+    if summary["loaded"]:
+        print(f"\n[WARN] Heavy packages imported at startup: {', '.join(summary['loaded'])}")
+    else:
+        print(f"\nNone of {', '.join(HEAVY)} imported at startup.")
+
+
+if __name__ == "__main__":
+    main()
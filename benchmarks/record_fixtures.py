@@ -0,0 +1,35 @@
+# Re-record the fixture pages from the live official sites. Pages are loaded
+# the same way the scrapers load them (static GET first, browser if the ready
+# element is missing), so JS-rendered content is captured too.
+#
+#   python -m benchmarks.record_fixtures [country ...]
+import os
+import sys
+
+from backend.scrape.driver_pool import driver_pool
+from backend.scrape.page_loader import fetch_source
+from backend.scrape.registry import SCRAPERS
+from backend.scrape.requirements import HEADERS  # noqa: F401  (registers the scrapers)
+from benchmarks.common import fixture_path
+
+
+def main(keys: list):
+    try:
+        for key in keys or list(SCRAPERS):
+            for source in SCRAPERS[key].sources:
+                try:
+                    html = fetch_source(source)
+                except Exception as e:
+                    print(f"[ERROR] {key}: could not record {source.url}: {e}")
+                    continue
+                path = fixture_path(source.url)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(html)
+                print(f"[INFO] {key}: {source.url} -> {os.path.relpath(path)} ({len(html)} bytes)")
+    finally:
+        driver_pool.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
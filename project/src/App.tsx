@@ -53,29 +53,18 @@ function App() {
     setRequirements(null);
 
     try {
-      // First, get the roadmap
-      const response = await fetch('https://japaavisorai.onrender.com/generate-roadmap', {
+      // Roadmap and visa requirements come back together in one round trip
+      const response = await fetch('https://japaavisorai.onrender.com/api/plan', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(formData),
       });
 
       if (!response.ok) throw new Error(`Roadmap error: ${response.status}`);
-      const data = await response.json();
+      const { requirements: visaData, ...data } = await response.json();
       setResult(data);
 
-      // Then, try to get visa requirements
-      const visaRes = await fetch('https://japaavisorai.onrender.com/api/requirements', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          country: formData.targetCountry,
-          nationality: 'Nigeria'
-        }),
-      });
-
-      if (visaRes.ok) {
-        const visaData = await visaRes.json();
+      if (visaData && !visaData.error) {
         setRequirements(visaData);
       } else {
         console.warn('Visa requirements not available');
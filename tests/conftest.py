@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Keep module-level stores (snapshot DB, research results) in memory during tests.
+os.environ.setdefault("SNAPSHOT_DB_PATH", "")
+os.environ.setdefault("RESEARCH_DB_PATH", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
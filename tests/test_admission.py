@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from backend import admission
+from backend.admission import ConcurrencyLimiter, TokenBuckets, client_address
+
+
+def scope(*forwarded, client="10.0.0.1"):
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return {"headers": headers, "client": (client, 443)}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+
+def test_client_address_ignores_forwarded_header_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(admission, "PROXY_HOPS", 0)
+    assert client_address(scope("203.0.113.7")) == "10.0.0.1"
+
+
+def test_client_address_counts_hops_from_the_right(monkeypatch):
+    monkeypatch.setattr(admission, "PROXY_HOPS", 1)
+    # The leftmost entry is whatever the client sent; the proxy appended the last.
+    assert client_address(scope("6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    assert client_address(scope("6.6.6.6", "203.0.113.7")) == "203.0.113.7"
+    monkeypatch.setattr(admission, "PROXY_HOPS", 2)
+    assert client_address(scope("6.6.6.6, 203.0.113.7, 10.1.1.1")) == "203.0.113.7"
+
+
+def test_client_address_falls_back_to_peer_when_hops_are_missing(monkeypatch):
+    monkeypatch.setattr(admission, "PROXY_HOPS", 2)
+    assert client_address(scope("203.0.113.7")) == "10.0.0.1"
+    assert client_address(scope()) == "10.0.0.1"
+
+
+def test_bucket_refuses_after_burst_and_refills(clock):
+    buckets = TokenBuckets(rate_per_minute=6, burst=2)
+    assert buckets.take("a") == 0
+    assert buckets.take("a") == 0
+    assert buckets.take("a") == pytest.approx(10.0)
+    clock.now += 10
+    assert buckets.take("a") == 0
+    # Another client has its own bucket.
+    assert buckets.take("b") == 0
+
+
+def test_least_recently_seen_client_is_evicted(clock):
+    buckets = TokenBuckets(rate_per_minute=6, burst=1, max_clients=2)
+    buckets.take("a")
+    buckets.take("b")
+    buckets.take("a")
+    buckets.take("c")
+    assert len(buckets) == 2
+    # "a" is still tracked with an empty bucket; "b" was dropped, so it starts
+    # over with a full burst.
+    assert buckets.take("a") > 0
+    assert buckets.take("b") == 0
+
+
+def test_limiter_rejects_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        limiter = ConcurrencyLimiter(concurrency=1, queue_size=1, queue_timeout=0.05)
+        assert await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        # Slot taken and queue full: turned away without waiting.
+        assert not await limiter.acquire()
+        # The queued request gives up after queue_timeout.
+        assert not await queued
+        limiter.release()
+        assert await limiter.acquire()
+        assert limiter.active == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from backend.scrape.cache import RequirementsCache
+
+
+def test_cancelled_waiter_does_not_cancel_shared_load():
+    cache = RequirementsCache(store=None)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"documents": ["Passport"]}
+
+    async def scenario():
+        first = asyncio.create_task(cache.aget("uk", loader))
+        second = asyncio.create_task(cache.aget("uk", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        value = await second
+        await asyncio.gather(first, return_exceptions=True)
+        return first, value
+
+    first, value = asyncio.run(scenario())
+    assert first.cancelled()
+    assert value == {"documents": ["Passport"]}
+    assert calls == 1
+    assert cache.peek("uk") == value
+    assert cache.inflight("uk") is None
+
+
+def test_fallback_does_not_replace_live_payload():
+    class Store:
+        def __init__(self):
+            self.saved = []
+
+        def save(self, key, value):
+            self.saved.append((key, value))
+
+    store = Store()
+    cache = RequirementsCache(store=store)
+    cache.set("uk", {"documents": ["live doc"]}, fetched_at=0)
+
+    async def loader():
+        return {"documents": ["kb doc"], "used_fallback": True}
+
+    value = asyncio.run(cache.aget("uk", loader))
+    assert value["used_fallback"]
+    assert cache.peek("uk") == {"documents": ["live doc"]}
+    assert store.saved == []
+
+
+def test_lookup_counts_hits_and_misses():
+    cache = RequirementsCache(ttl=60, store=None)
+    cache.set("uk", {"documents": []})
+    cache.set("usa", {"documents": []}, fetched_at=0)
+    assert cache.lookup("uk") is not None
+    assert cache.lookup("usa") is not None
+    assert cache.lookup("canada") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_snapshot_save_runs_off_the_event_loop():
+    class SlowStore:
+        def save(self, key, value):
+            time.sleep(0.2)
+
+    cache = RequirementsCache(store=SlowStore())
+    ticks = 0
+
+    async def loader():
+        return {"documents": ["Passport"]}
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def scenario():
+        task = asyncio.create_task(ticker())
+        value = await cache.aget("uk", loader)
+        task.cancel()
+        return value
+
+    assert asyncio.run(scenario()) == {"documents": ["Passport"]}
+    assert ticks >= 5
@@ -0,0 +1,30 @@
+import json
+
+from backend.knowledge.base import KnowledgeBase, seed_cache
+from backend.scrape.cache import RequirementsCache
+
+RECORD = {
+    "country_key": "uk", "country": "UK", "visa_type": "Student Visa", "default": True,
+    "documents": ["Passport"], "fees": {"total": "£490"}, "language_tests": [], "language_requirements": "",
+    "timeline": "", "official_links": [], "special_notes": [],
+}
+
+
+def write_kb(tmp_path, **extra):
+    path = tmp_path / "knowledge_base.json"
+    path.write_text(json.dumps({"version": 1, "index": {"uk": {"": 0, "student visa": 0}}, "records": [RECORD], **extra}))
+    return KnowledgeBase(str(path))
+
+
+def test_seeded_entries_are_never_fresh_without_as_of(tmp_path):
+    cache = RequirementsCache(store=None)
+    assert seed_cache(cache, write_kb(tmp_path)) == 1
+    assert cache.peek("uk")["used_fallback"]
+    assert cache.age("uk") > cache.ttl
+
+
+def test_seeded_entries_are_dated_as_of(tmp_path):
+    cache = RequirementsCache(store=None)
+    seed_cache(cache, write_kb(tmp_path, as_of="2025-01-01"))
+    assert cache.age("uk") > cache.ttl
+    assert seed_cache(cache, write_kb(tmp_path, as_of="2025-01-01")) == 0
@@ -0,0 +1,21 @@
+import asyncio
+
+from backend.scrape.research import MockResearchBackend, ResearchJobs, ResearchStore
+
+
+def test_submit_coalesces_then_serves_from_store():
+    backend = MockResearchBackend(latency=0.05)
+    jobs = ResearchJobs(backend=backend, store=ResearchStore(""))
+
+    async def scenario():
+        first, first_coalesced = await jobs.submit("Canada", "Nigeria")
+        second, second_coalesced = await jobs.submit("canada", " nigeria ")
+        await asyncio.sleep(0.1)
+        third, third_coalesced = await jobs.submit("Canada", "Nigeria")
+        return (first, first_coalesced), (second, second_coalesced), (third, third_coalesced)
+
+    (first, first_coalesced), (second, second_coalesced), (third, third_coalesced) = asyncio.run(scenario())
+    assert not first_coalesced and second_coalesced and second is first
+    assert first.status == "done" and not first.stored
+    assert third.stored and not third_coalesced and third.result == first.result
+    assert backend.calls == 1
@@ -0,0 +1,72 @@
+import json
+
+from backend.json_repair import repair_json
+from backend.json_stream import TopLevelFieldParser
+from backend.roadmap import parse_roadmap
+
+
+def test_parse_roadmap_repairs_badly_shaped_fields():
+    text = json.dumps({
+        "roadmap": "Apply early.",
+        "checklist": "- Passport\n- Transcripts",
+        "sop": None,
+        "opportunities": [{"title": "Chevening", "url": "https://www.chevening.org", "type": "Scholarship"}, "oops"],
+    })
+    data, complete = parse_roadmap(text)
+    assert complete
+    assert data["checklist"] == ["Passport", "Transcripts"]
+    assert data["sop"] == ""
+    assert data["opportunities"] == [{"title": "Chevening", "url": "https://www.chevening.org", "type": "scholarship"}]
+
+
+def test_repair_json_strips_fences_and_trailing_commas():
+    text = 'Here you go:\n```json\n{"roadmap": "Apply.", "checklist": ["Passport", "CAS",],}\n```'
+    assert repair_json(text) == ({"roadmap": "Apply.", "checklist": ["Passport", "CAS"]}, False)
+
+
+def test_repair_json_closes_a_truncated_object():
+    data, truncated = repair_json('{"roadmap": "Apply.", "checklist": ["Passport", "CA')
+    assert truncated
+    assert data == {"roadmap": "Apply.", "checklist": ["Passport", "CA"]}
+
+
+def test_repair_json_backs_off_to_the_last_complete_member():
+    # A dangling key can't be closed, so the object is cut back to the comma.
+    data, truncated = repair_json('{"roadmap": "Apply, then wait.", "checklist": ["Passport"], "sop')
+    assert truncated
+    assert data == {"roadmap": "Apply, then wait.", "checklist": ["Passport"]}
+
+
+def test_repair_json_gives_up_without_an_object():
+    assert repair_json("Sorry, I can't help with that.") == (None, False)
+    assert repair_json("") == (None, False)
+
+
+def feed_in_chunks(parser, text, size):
+    fields = []
+    for start in range(0, len(text), size):
+        fields.extend(parser.feed(text[start:start + size]))
+    return fields
+
+
+def test_field_parser_yields_each_field_once_complete():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"roadmap": "Apply early", "check') == [("roadmap", "Apply early")]
+    assert parser.feed('list": ["a", "b"]') == []
+    assert parser.feed(', "sop": "x"}') == [("checklist", ["a", "b"]), ("sop", "x")]
+    assert parser.done
+
+
+def test_field_parser_ignores_delimiters_inside_strings():
+    text = json.dumps({
+        "roadmap": 'Say "hi", then {wait} [and] \\ go',
+        "checklist": ["a, b", "c}"],
+        "opportunities": [{"title": "x", "url": "https://e.org/?a=1,2"}],
+    })
+    for size in (1, 3, 7, len(text)):
+        assert dict(feed_in_chunks(TopLevelFieldParser(), text, size)) == json.loads(text)
+
+
+def test_field_parser_skips_a_leading_fence():
+    text = '```json\n{"roadmap": "r", "sop": "s"}\n```'
+    assert feed_in_chunks(TopLevelFieldParser(), text, 4) == [("roadmap", "r"), ("sop", "s")]
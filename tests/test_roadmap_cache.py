@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from backend.roadmap_cache import RoadmapCache, anonymize, personalize
+
+ROADMAP = {
+    "roadmap": "Ada Obi should apply early.",
+    "checklist": ["Ada: book IELTS", "Translate the Obi family documents"],
+    "sop": "My name is Ada Obi. I studied at Adamawa State University, like Mr. Obiora.",
+    "opportunities": [{"title": "Scholarship for Ada", "url": "https://example.org/ada", "type": "scholarship"}],
+}
+
+
+def profile(full_name, degree="BSc"):
+    return SimpleNamespace(fullName=full_name, degree=degree, workExperience="2 years", targetCountry="uk", goal="MSc")
+
+
+def test_round_trip_swaps_the_name_and_leaves_other_words_alone():
+    stored = anonymize(ROADMAP, "Ada Obi")
+    assert stored["roadmap"] == "{{FULL_NAME}} should apply early."
+    assert stored["checklist"] == ["{{FIRST_NAME}}: book IELTS", "Translate the {{LAST_NAME}} family documents"]
+    # Parts of other words are not names.
+    assert "Adamawa" in stored["sop"] and "Obiora" in stored["sop"]
+    # Lowercase text such as URLs is left as is.
+    assert stored["opportunities"][0]["url"] == "https://example.org/ada"
+
+    served = personalize(stored, "Bola Tinubu")
+    assert served["roadmap"] == "Bola Tinubu should apply early."
+    assert served["checklist"] == ["Bola: book IELTS", "Translate the Tinubu family documents"]
+    assert served["sop"] == "My name is Bola Tinubu. I studied at Adamawa State University, like Mr. Obiora."
+    assert served["opportunities"][0]["title"] == "Scholarship for Bola"
+
+
+def test_single_word_names():
+    stored = anonymize({"sop": "Dear Ada, welcome."}, "Ada")
+    assert stored == {"sop": "Dear {{FULL_NAME}}, welcome."}
+    assert personalize(stored, "Bola") == {"sop": "Dear Bola, welcome."}
+    # With no last name to substitute, the first name stands in.
+    assert personalize({"sop": "Mr. {{LAST_NAME}}"}, "Bola") == {"sop": "Mr. Bola"}
+
+
+def test_cache_never_serves_one_users_name_to_another():
+    cache = RoadmapCache(path="")
+    cache.put(profile("Ada Obi"), ROADMAP)
+    served = cache.get(profile("Bola Tinubu"))
+    text = str(served)
+    assert "Ada Obi" not in text and "Ada:" not in text and "Obi family" not in text
+    assert cache.get(profile("Bola Tinubu", degree="BA")) is None
@@ -0,0 +1,26 @@
+import pytest
+
+from backend.scrape.snapshots import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "snapshots.db"))
+
+
+def test_diff_only_compares_snapshots_of_the_same_country(store):
+    first = store.save("uk", {"documents": ["Passport"]})
+    store.save("germany", {"documents": ["Blocked account"]})
+    second = store.save("uk", {"documents": ["Passport", "CAS"]})
+
+    diff = store.diff("uk", first, second)
+    assert diff["changes"] == {"documents": {"added": ["CAS"], "removed": []}}
+    assert store.diff("uk") == diff
+    assert store.diff("uk", first, second + 1) is None
+    assert store.get("germany", first) is None
+
+
+def test_diff_needs_both_ids_or_neither(store):
+    first = store.save("uk", {"documents": ["Passport"]})
+    with pytest.raises(ValueError):
+        store.diff("uk", from_id=first)